@@ -274,6 +274,7 @@ def add_job(payload: dict):
         session.add(job)
         session.commit()
         session.refresh(job)
+        scheduler.notify()
         return {"ok": True, "job": job.to_dict()}
 
 
@@ -11,6 +11,10 @@ from typing import Callable, Optional
 import yaml
 from playwright.sync_api import BrowserContext, Page, sync_playwright
 
+from .dom_extract import DOM_EXTRACT_INIT_SCRIPT
+from .manual_gate import CAPTCHA_PROBE_INIT_SCRIPT
+from .playwright_stack import install_fast_stack_capture
+
 LogFn = Callable[[str, str], None]
 
 
@@ -87,8 +91,11 @@ class BrowserManager:
         # 清理 None 参数
         launch_args = {k: v for k, v in launch_args.items() if v is not None}
 
+        # 同步 API 每次调用都会采集调用栈，启动前换上不读源码的轻量实现
+        install_fast_stack_capture()
         playwright = sync_playwright().start()
         context = playwright.chromium.launch_persistent_context(**launch_args)
+        self._install_init_scripts(context)
         page = context.new_page()
 
         self._attach_basic_listeners(page)
@@ -101,6 +108,15 @@ class BrowserManager:
             simplify_loaded=bool(simplify_path),
         )
 
+    def _install_init_scripts(self, context: BrowserContext) -> None:
+        """新文档创建时预装快照提取与验证码探测脚本，调用时无需每次发送完整源码。"""
+        try:
+            context.add_init_script(
+                script=DOM_EXTRACT_INIT_SCRIPT + "\n" + CAPTCHA_PROBE_INIT_SCRIPT
+            )
+        except Exception as exc:
+            self._log(f"⚠ 预装页面脚本失败: {exc}", "warn")
+
     def _attach_basic_listeners(self, page: Page) -> None:
         """采集页面基础错误信息，写入日志便于排查。"""
         try:
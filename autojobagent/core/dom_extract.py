@@ -0,0 +1,537 @@
+"""
+页面 DOM 提取（V2 拆分）
+
+职责：
+- 可交互元素快照与问题块提取共用同一份页面脚本（clean/isVisible/样式缓存）
+- 一次 page.evaluate 同时返回快照元素与问题块，避免重复遍历 DOM 与 CDP 往返
+- 暂存同次提取得到的问题块，供 build_question_blocks 直接复用
+- 提取脚本按文档安装一次（init script / 首次调用时安装），之后只发送短调用脚本
+"""
+
+from __future__ import annotations
+
+from typing import Any
+from weakref import WeakKeyDictionary
+
+_COMMON_JS = """
+  // 与 Python str.split() 的空白集合对齐（额外含 \\x1c-\\x1f、\\x85），
+  // 输出即为 Python 侧 " ".join(v.split()) 的结果，无需再次归一化
+  const clean = (v) => String(v || "").replace(/[\\s\\x1c-\\x1f\\x85]+/g, " ").trim();
+  // 同一次 evaluate 内样式只计算一次，快照与问题块提取共用
+  const styleCache = new Map();
+  const styleOf = (el) => {
+    let st = styleCache.get(el);
+    if (st === undefined) {
+      st = window.getComputedStyle(el);
+      styleCache.set(el, st);
+    }
+    return st;
+  };
+  // 先用布局盒做廉价判定，只有可能可见（有面积）或无布局盒（display:contents/none）
+  // 的元素才读取计算样式
+  const isVisible = (el) => {
+    if (!el) return false;
+    const rect = el.getBoundingClientRect();
+    if (rect.width > 0 && rect.height > 0) {
+      const st = styleOf(el);
+      return !st || st.visibility === "visible";
+    }
+    if (el.getClientRects().length > 0) return false;
+    const st = styleOf(el);
+    if (!st) return true;
+    if (st.display !== "contents") return false;
+    for (let child = el.firstElementChild; child; child = child.nextElementSibling) {
+      if (isVisible(child)) return true;
+    }
+    return false;
+  };
+"""
+
+# 按 Playwright get_by_role 的隐式/显式角色规则归类（穿透 open shadow root），
+# 每个角色取前 maxPerRole 个 ARIA 可见候选，再按 is_visible 规则过滤并提取元数据；
+# 有名元素累计达到 maxTotal 后不再描述后续角色与 file input（Python 侧同样截断）；
+# file input 补充扫描在同一次遍历中完成。
+_SNAPSHOT_FN_JS = """
+  const collectSnapshot = (roles, maxPerRole, maxTotal, detectAssist) => {
+    const INPUT_ROLES = {
+      button: "button",
+      checkbox: "checkbox",
+      image: "button",
+      number: "spinbutton",
+      radio: "radio",
+      range: "slider",
+      reset: "button",
+      submit: "button"
+    };
+    const implicitRoleOf = (el) => {
+      switch (el.tagName) {
+        case "A":
+        case "AREA":
+          return el.hasAttribute("href") ? "link" : "";
+        case "BUTTON":
+          return "button";
+        case "OPTION":
+          return "option";
+        case "TEXTAREA":
+          return "textbox";
+        case "SELECT":
+          return el.hasAttribute("multiple") || el.size > 1 ? "listbox" : "combobox";
+        case "INPUT": {
+          const type = String(el.type || "").toLowerCase();
+          if (type === "search") {
+            return el.hasAttribute("list") ? "combobox" : "searchbox";
+          }
+          if (["email", "tel", "text", "url", ""].includes(type)) {
+            const list = el.list;
+            return list && list.tagName === "DATALIST" ? "combobox" : "textbox";
+          }
+          if (type === "hidden") return "";
+          return INPUT_ROLES[type] || "textbox";
+        }
+      }
+      return "";
+    };
+    const roleOf = (el) => {
+      const explicit = (el.getAttribute("role") || "")
+        .split(" ")
+        .map((r) => r.trim())
+        .find(Boolean);
+      if (!explicit) return implicitRoleOf(el);
+      if (explicit === "none" || explicit === "presentation") {
+        const implicit = implicitRoleOf(el);
+        return implicit && el.tabIndex >= 0 ? implicit : explicit;
+      }
+      return explicit;
+    };
+    const parentOf = (el) =>
+      el.parentElement || (el.parentNode && el.parentNode.host) || null;
+    const hiddenCache = new Map();
+    const belongsToHidden = (el) => {
+      let hidden = hiddenCache.get(el);
+      if (hidden === undefined) {
+        const st = styleOf(el);
+        hidden =
+          !st ||
+          st.display === "none" ||
+          String(el.getAttribute("aria-hidden")).toLowerCase() === "true";
+        if (!hidden) {
+          const parent = parentOf(el);
+          if (parent) hidden = belongsToHidden(parent);
+        }
+        hiddenCache.set(el, hidden);
+      }
+      return hidden;
+    };
+    const hiddenForAria = (el) => {
+      const isOptionInSelect = el.tagName === "OPTION" && !!el.closest("select");
+      if (!isOptionInSelect && styleOf(el).visibility !== "visible") return true;
+      return belongsToHidden(el);
+    };
+    const hasAssistKeyword = (v) => {
+      const t = String(v || "").toLowerCase();
+      return t.includes("simplify") || t.includes("autofill") || t.includes("copilot");
+    };
+    // 单个节点是否像插件面板只取决于节点本身：按节点缓存，
+    // 表单内元素共享的祖先只判定一次；
+    // 先比对属性，定位为 fixed/sticky 时才读取布局盒与 innerText
+    const assistHitCache = new Map();
+    const isAssistNode = (cur) => {
+      let hit = assistHitCache.get(cur);
+      if (hit !== undefined) return hit;
+      const attrs = [
+        cur.id || "",
+        cur.className || "",
+        cur.getAttribute("data-testid") || "",
+        cur.getAttribute("aria-label") || "",
+        cur.getAttribute("title") || "",
+        cur.getAttribute("name") || ""
+      ].join(" ");
+      hit = hasAssistKeyword(attrs);
+      if (!hit) {
+        const st = styleOf(cur);
+        if (st.position === "fixed" || st.position === "sticky") {
+          const rect = cur.getBoundingClientRect();
+          const fixedRightPanel =
+            rect.width > 120 &&
+            rect.width <= 460 &&
+            rect.left > window.innerWidth * 0.45;
+          hit =
+            fixedRightPanel &&
+            hasAssistKeyword(String(cur.innerText || "").slice(0, 180));
+        }
+      }
+      assistHitCache.set(cur, hit);
+      return hit;
+    };
+    const inAssistPanelOf = (el) => {
+      let cur = el;
+      for (let i = 0; i < 8 && cur; i++) {
+        if (isAssistNode(cur)) return true;
+        cur = cur.parentElement;
+      }
+      return false;
+    };
+    const describe = (el) => {
+      try {
+        const label = el.labels && el.labels.length ? el.labels[0].innerText : "";
+        const aria = el.getAttribute("aria-label") || "";
+        const placeholder = el.getAttribute("placeholder") || "";
+        const name = el.getAttribute("name") || "";
+        const type = el.getAttribute("type") || "";
+        const tag = (el.tagName || "").toLowerCase();
+        const required = !!(el.required || el.getAttribute("aria-required") === "true");
+        const inForm = !!el.closest("form");
+        // 祖先遍历需读样式与布局盒；不过滤插件面板时整段跳过
+        const inAssistPanel = detectAssist === false ? false : inAssistPanelOf(el);
+        // Toggle / value state for fingerprinting
+        let checked = null;
+        if (type === "checkbox" || type === "radio") {
+          checked = !!el.checked;
+        } else if (el.getAttribute("aria-pressed") !== null) {
+          checked = el.getAttribute("aria-pressed") === "true";
+        } else if (el.getAttribute("aria-selected") !== null) {
+          checked = el.getAttribute("aria-selected") === "true";
+        } else if (el.getAttribute("aria-checked") !== null) {
+          checked = el.getAttribute("aria-checked") === "true";
+        }
+        const rawVal = el.value || "";
+        const valueHint = rawVal.length > 20 ? rawVal.substring(0, 20) : rawVal;
+        return {
+          label, aria, placeholder, name, type, tag,
+          required, inForm, inAssistPanel, checked, valueHint
+        };
+      } catch (e) {
+        return {};
+      }
+    };
+
+    const candidates = {};
+    roles.forEach((role) => { candidates[role] = []; });
+    const fileInputs = [];
+    // 每个元素只计算一个角色、只进入一个分桶，跨角色不会重复描述
+    const visit = (root) => {
+      for (const el of root.querySelectorAll("*")) {
+        const role = roleOf(el);
+        const bucket = candidates[role];
+        if (bucket && bucket.length < maxPerRole && !hiddenForAria(el)) bucket.push(el);
+        if (
+          el.tagName === "INPUT" &&
+          String(el.getAttribute("type")).toLowerCase() === "file" &&
+          fileInputs.length < maxPerRole
+        ) {
+          fileInputs.push(el);
+        }
+        if (el.shadowRoot) visit(el.shadowRoot);
+      }
+    };
+    visit(document);
+
+    // 可见的 file input 同时是 textbox 候选：同一元素只描述一次，两处共用结果
+    const described = new Map();
+    const describeOnce = (el) => {
+      let meta = described.get(el);
+      if (meta === undefined) {
+        meta = describe(el);
+        described.set(el, meta);
+      }
+      return meta;
+    };
+    // 角色元素在页面内算好显示名（label > aria > text > placeholder > name），
+    // 无名元素直接丢弃，只回传快照需要的字段；innerText 仅在 label/aria 为空时读取
+    const BLANK_NAME_RE = new RegExp(
+      "^[\\\\t-\\\\r\\\\x1c-\\\\x20\\\\x85\\\\xa0\\\\u1680\\\\u2000-\\\\u200a" +
+        "\\\\u2028\\\\u2029\\\\u202f\\\\u205f\\\\u3000]*$"
+    );
+    const roleRecordOf = (el) => {
+      const meta = describeOnce(el);
+      // describe 出错时返回空对象：与原先一致视为无名元素
+      if (meta.tag === undefined) return null;
+      const name =
+        meta.label ||
+        meta.aria ||
+        (el.innerText || "").trim() ||
+        meta.placeholder ||
+        meta.name ||
+        "";
+      // 与 Python 侧 name.strip() 为空的判定一致（str.isspace 字符集）
+      if (!name || BLANK_NAME_RE.test(name)) return null;
+      return {
+        name,
+        type: meta.type,
+        tag: meta.tag,
+        required: meta.required,
+        inForm: meta.inForm,
+        inAssistPanel: meta.inAssistPanel,
+        checked: meta.checked,
+        valueHint: meta.valueHint
+      };
+    };
+    let remaining = maxTotal ?? Infinity;
+    const byRole = {};
+    roles.forEach((role) => {
+      const records = [];
+      for (const el of candidates[role]) {
+        if (remaining <= 0) break;
+        if (!isVisible(el)) continue;
+        const record = roleRecordOf(el);
+        if (record) {
+          records.push(record);
+          remaining--;
+        }
+      }
+      byRole[role] = records;
+    });
+    // file input 的显示名顺序不同（label > aria > name > placeholder），
+    // 为空时由 Python 侧按序号补名
+    const fileRecordOf = (el) => {
+      const meta = describeOnce(el);
+      return {
+        name: meta.label || meta.aria || meta.name || meta.placeholder || "",
+        tag: meta.tag,
+        required: meta.required,
+        inForm: meta.inForm,
+        inAssistPanel: meta.inAssistPanel,
+        valueHint: meta.valueHint
+      };
+    };
+    const files = remaining > 0 ? fileInputs.slice(0, remaining).map(fileRecordOf) : [];
+    return { roles: byRole, files };
+  };
+"""
+
+_QUESTION_BLOCKS_FN_JS = """
+  const collectQuestionBlocks = () => {
+    // 选择器列表一次查询：同时命中多个选择器的元素（如 button[aria-pressed='true']）
+    // 在结果中只出现一次，按文档顺序排列，无需额外去重
+    const controlNodes = document.querySelectorAll(
+      "input[type='radio'], input[type='checkbox'], " +
+        "[role='radio'], [role='checkbox'], " +
+        "button[aria-pressed], [aria-pressed='true'], [aria-pressed='false']"
+    );
+    const controlCandidates = [];
+    for (let i = 0, n = controlNodes.length; i < n; i++) {
+      const el = controlNodes[i];
+      if (isVisible(el)) controlCandidates.push(el);
+    }
+
+    // 与 closest(fieldset) || closest(radiogroup) || closest(group)
+    // || closest([aria-labelledby]) || parentElement 等价：
+    // 一次向上遍历记下各类最近祖先，遇到 fieldset 即可停止
+    const containerOf = (el) => {
+      let radioGroup = null;
+      let group = null;
+      let labelled = null;
+      for (let cur = el; cur; cur = cur.parentElement) {
+        if (cur.tagName === "FIELDSET") return cur;
+        const role = cur.getAttribute("role");
+        if (radioGroup === null && role === "radiogroup") radioGroup = cur;
+        if (group === null && role === "group") group = cur;
+        if (labelled === null && cur.hasAttribute("aria-labelledby")) labelled = cur;
+      }
+      return radioGroup || group || labelled || el.parentElement;
+    };
+
+    const questionTextOf = (container) => {
+      if (!container) return "";
+      const legend = clean(container.querySelector("legend")?.innerText);
+      if (legend) return legend;
+      const ariaLabel = clean(container.getAttribute("aria-label"));
+      if (ariaLabel) return ariaLabel;
+      const labelledBy = container.getAttribute("aria-labelledby");
+      if (labelledBy) {
+        const parts = labelledBy
+          .split(/\\s+/)
+          .map((id) => clean(document.getElementById(id)?.innerText))
+          .filter(Boolean);
+        if (parts.length) return clean(parts.join(" "));
+      }
+      const labelLike = clean(
+        container.querySelector("label, h1, h2, h3, h4, p, span")?.innerText
+      );
+      return labelLike;
+    };
+
+    const optionTextOf = (el) => {
+      const labelFromFor = (() => {
+        const id = el.getAttribute("id");
+        if (!id) return "";
+        return clean(document.querySelector(`label[for="${id}"]`)?.innerText);
+      })();
+      const own = clean(el.innerText);
+      const aria = clean(el.getAttribute("aria-label"));
+      const parent = clean(el.parentElement?.innerText);
+      return labelFromFor || own || aria || parent;
+    };
+
+    const selectedOf = (el) => {
+      if (el.matches("input[type='radio'], input[type='checkbox']")) {
+        return !!el.checked;
+      }
+      const ariaChecked = el.getAttribute("aria-checked");
+      if (ariaChecked === "true") return true;
+      if (ariaChecked === "false") return false;
+      const ariaPressed = el.getAttribute("aria-pressed");
+      if (ariaPressed === "true") return true;
+      if (ariaPressed === "false") return false;
+      const cls = String(el.className || "").toLowerCase();
+      return (
+        cls.includes("selected") || cls.includes("active") || cls.includes("checked")
+      );
+    };
+
+    const roleOf = (el) => {
+      const tag = (el.tagName || "").toLowerCase();
+      const type = (el.getAttribute("type") || "").toLowerCase();
+      if (tag === "input" && type === "radio") return "radio";
+      if (tag === "input" && type === "checkbox") return "checkbox";
+      const role = (el.getAttribute("role") || "").toLowerCase();
+      if (role) return role;
+      return tag || "unknown";
+    };
+
+    // 容器 -> { 问题文本, blocks 下标 }：问题文本每个容器只计算一次，
+    // 分组按首次出现顺序追加
+    const containerInfo = new WeakMap();
+    const blocks = [];
+    controlCandidates.forEach((el) => {
+      const container = containerOf(el);
+      const key = container || el;
+      let info = containerInfo.get(key);
+      if (info === undefined) {
+        info = { qText: clean(questionTextOf(container)), index: -1 };
+        containerInfo.set(key, info);
+      }
+      const qText = info.qText;
+      const optText = clean(optionTextOf(el));
+      if (!qText || !optText) return;
+      const role = roleOf(el);
+      const selected = selectedOf(el);
+      const disabled = !!el.disabled || el.getAttribute("aria-disabled") === "true";
+      const invalid = !!el.ariaInvalid || el.getAttribute("aria-invalid") === "true";
+      if (info.index < 0) {
+        info.index = blocks.length;
+        blocks.push({
+          question_id: `q${info.index + 1}`,
+          question_text: qText,
+          control_type: role === "radio" ? "single_choice" : "choice_group",
+          required:
+            !!el.required ||
+            el.getAttribute("aria-required") === "true" ||
+            /\\*\\s*$/.test(qText),
+          has_error: invalid,
+          options: []
+        });
+      }
+      const bucket = blocks[info.index];
+      bucket.options.push({
+        text: optText,
+        role,
+        selected,
+        disabled
+      });
+      if (invalid) bucket.has_error = true;
+    });
+
+    return blocks.filter((g) => g.options.length >= 2).slice(0, 16);
+  };
+"""
+
+DOM_EXTRACT_JS = (
+    "({ roles, maxPerRole, maxTotal, detectAssist }) => {"
+    + _COMMON_JS
+    + _SNAPSHOT_FN_JS
+    + _QUESTION_BLOCKS_FN_JS
+    + """
+  const snapshot = collectSnapshot(roles, maxPerRole, maxTotal, detectAssist);
+  let blocks = null;
+  try {
+    blocks = collectQuestionBlocks();
+  } catch (e) {
+    blocks = null;
+  }
+  return { roles: snapshot.roles, files: snapshot.files, blocks };
+}
+"""
+)
+
+# 页面内安装位置：Symbol.for 键不会与页面自身的全局变量冲突
+_INSTALL_KEY_JS = 'Symbol.for("autojobagent.domExtract")'
+
+# 已安装时直接调用；未安装（init script 之前创建的文档）返回 null 由调用方回退
+_DOM_EXTRACT_CALL_JS = (
+    "(arg) => { const fn = window[" + _INSTALL_KEY_JS + "];"
+    " return fn ? fn(arg) : null; }"
+)
+
+# 回退路径：发送完整脚本，安装到当前文档后执行，同一文档后续调用走短脚本
+_DOM_EXTRACT_INSTALL_JS = (
+    "(arg) => { const fn = "
+    + DOM_EXTRACT_JS
+    + "; window["
+    + _INSTALL_KEY_JS
+    + "] = fn; return fn(arg); }"
+)
+
+# 供 BrowserContext.add_init_script 使用：每个新文档创建时预先安装
+DOM_EXTRACT_INIT_SCRIPT = "window[" + _INSTALL_KEY_JS + "] = " + DOM_EXTRACT_JS + ";"
+
+QUESTION_BLOCKS_JS = (
+    "() => {"
+    + _COMMON_JS
+    + _QUESTION_BLOCKS_FN_JS
+    + """
+  return collectQuestionBlocks();
+}
+"""
+)
+
+# page -> (snapshot_map, 问题块原始数据)；只在同一快照上被消费一次
+_PENDING_QUESTION_BLOCKS: WeakKeyDictionary[Any, tuple[dict, list]] = (
+    WeakKeyDictionary()
+)
+
+
+def extract_page_dom(
+    page,
+    roles: list[str],
+    max_per_role: int,
+    max_total: int | None = None,
+    *,
+    detect_assist: bool = True,
+) -> dict:
+    """一次 CDP 往返取回快照元素、file input 与问题块原始数据；失败返回空 dict。"""
+    arg = {
+        "roles": roles,
+        "maxPerRole": max_per_role,
+        "maxTotal": max_total,
+        "detectAssist": detect_assist,
+    }
+    try:
+        payload = page.evaluate(_DOM_EXTRACT_CALL_JS, arg)
+        if payload is None:
+            payload = page.evaluate(_DOM_EXTRACT_INSTALL_JS, arg)
+    except Exception:
+        return {}
+    return payload if isinstance(payload, dict) else {}
+
+
+def remember_question_blocks(page, snapshot_map: dict, raw_blocks) -> None:
+    try:
+        if isinstance(raw_blocks, list):
+            _PENDING_QUESTION_BLOCKS[page] = (snapshot_map, raw_blocks)
+        else:
+            _PENDING_QUESTION_BLOCKS.pop(page, None)
+    except TypeError:
+        # 不支持弱引用的 page 对象：不暂存，回退为单独提取
+        pass
+
+
+def take_question_blocks(page, snapshot_map: dict) -> list | None:
+    """取出与该快照同次提取的问题块；快照不匹配时返回 None。"""
+    try:
+        pending = _PENDING_QUESTION_BLOCKS.pop(page, None)
+    except TypeError:
+        return None
+    if pending is None or pending[0] is not snapshot_map:
+        return None
+    return pending[1]
@@ -6,8 +6,41 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
+from .keyword_match import phrase_pattern
+from .page_text import PageTextView, as_page_text_view
 
-@dataclass
+# 页面文本关键词：忽略大小写的单次扫描，无需为整页文本生成小写副本
+_CAPTCHA_TEXT_RE = phrase_pattern(
+    (
+        "captcha",
+        "verify you are human",
+        "i am not a robot",
+        "security check",
+        "complete the challenge",
+        "select all images",
+        "are you human",
+    )
+)
+_RECAPTCHA_NOTICE_RES = tuple(
+    phrase_pattern((phrase,))
+    for phrase in ("protected by recaptcha", "privacy policy", "terms of service")
+)
+_LOGIN_TEXT_RE = phrase_pattern(
+    ("sign in", "log in", "login", "sign-in", "authentication required")
+)
+_PASSWORD_TEXT_RE = phrase_pattern(
+    (
+        "password",
+        "verification code",
+        "two-factor",
+        "2fa",
+        "one-time code",
+        "otp",
+    )
+)
+
+
+@dataclass(slots=True, frozen=True)
 class ManualRequiredAssessment:
     """页面是否需要人工介入的结构化判定结果。"""
 
@@ -23,7 +56,7 @@ def detect_manual_required(visible_text: str) -> bool:
 
 
 def assess_manual_required(
-    visible_text: str,
+    visible_text: str | PageTextView,
     *,
     password_input_count: int = 0,
     captcha_element_count: int = 0,
@@ -32,7 +65,7 @@ def assess_manual_required(
     has_apply_cta: bool = False,
 ) -> ManualRequiredAssessment:
     """检测登录/验证码等需要人工介入的场景（证据化判定）。"""
-    text = (visible_text or "").lower()
+    page_text = as_page_text_view(visible_text)
     evidence: dict[str, int | bool] = {
         "password_input_count": max(password_input_count, 0),
         "captcha_element_count": max(captcha_element_count, 0),
@@ -40,7 +73,7 @@ def assess_manual_required(
         "has_login_button": bool(has_login_button),
         "has_apply_cta": bool(has_apply_cta),
     }
-    if not text and captcha_element_count <= 0 and password_input_count <= 0:
+    if not page_text.raw and captcha_element_count <= 0 and password_input_count <= 0:
         return ManualRequiredAssessment(
             manual_required=False,
             reason="no_text_no_dom_signal",
@@ -48,48 +81,32 @@ def assess_manual_required(
             evidence=evidence,
         )
 
-    captcha_keywords = [
-        "captcha",
-        "verify you are human",
-        "i am not a robot",
-        "security check",
-        "complete the challenge",
-        "select all images",
-        "are you human",
-    ]
-    has_captcha_text = any(k in text for k in captcha_keywords)
-    is_recaptcha_legal_notice = (
-        "protected by recaptcha" in text
-        and "privacy policy" in text
-        and "terms of service" in text
+    # DOM 证据已足以判定时直接返回，避免扫描长页面文本
+    if captcha_element_count > 0 or has_captcha_challenge_text:
+        return ManualRequiredAssessment(
+            manual_required=True,
+            reason="captcha_detected",
+            confidence=0.98 if captcha_element_count > 0 else 0.9,
+            evidence=evidence,
+        )
+
+    text = page_text.raw
+    has_captcha_text = _CAPTCHA_TEXT_RE.search(text) is not None
+    is_recaptcha_legal_notice = has_captcha_text and all(
+        pattern.search(text) is not None for pattern in _RECAPTCHA_NOTICE_RES
     )
     if is_recaptcha_legal_notice:
         has_captcha_text = False
-    if captcha_element_count > 0 or has_captcha_challenge_text or has_captcha_text:
+    if has_captcha_text:
         return ManualRequiredAssessment(
             manual_required=True,
             reason="captcha_detected",
-            confidence=0.98 if captcha_element_count > 0 else 0.9,
+            confidence=0.9,
             evidence=evidence,
         )
 
-    login_keywords = [
-        "sign in",
-        "log in",
-        "login",
-        "sign-in",
-        "authentication required",
-    ]
-    password_keywords = [
-        "password",
-        "verification code",
-        "two-factor",
-        "2fa",
-        "one-time code",
-        "otp",
-    ]
-    has_login_text = any(k in text for k in login_keywords)
-    has_password_text = any(k in text for k in password_keywords)
+    has_login_text = _LOGIN_TEXT_RE.search(text) is not None
+    has_password_text = _PASSWORD_TEXT_RE.search(text) is not None
 
     # 强信号：真实登录表单（密码框 + 登录语义）
     if password_input_count > 0 and (has_login_text or has_login_button):
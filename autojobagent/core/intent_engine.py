@@ -11,47 +11,109 @@ from __future__ import annotations
 
 import hashlib
 import json
+from functools import lru_cache
 
+from .keyword_match import compile_keyword_index, matched_groups
+from .page_text import PageTextView, as_page_text_view, text_digest
 from .ui_snapshot import SnapshotItem
 
 
-ALLOWED_LABEL_INTENTS = {
-    "apply_entry",
-    "login_action",
-    "progression_action",
-    "upload_request",
+ALLOWED_LABEL_INTENTS: frozenset[str] = frozenset(
+    {
+        "apply_entry",
+        "login_action",
+        "progression_action",
+        "upload_request",
+    }
+)
+ALLOWED_TEXT_INTENTS: frozenset[str] = frozenset({"login_action", "upload_request"})
+
+# 高频且语义无歧义的按钮文案：直接用硬规则定案，不占用 LLM 调用
+_LOCALLY_SETTLED_LABELS: frozenset[str] = frozenset(
+    {
+        "apply",
+        "apply now",
+        "apply for this job",
+        "apply for this position",
+        "apply for this role",
+        "next",
+        "continue",
+        "submit",
+        "review",
+        "sign in",
+        "log in",
+        "login",
+        "upload",
+        "upload resume",
+        "upload cv",
+        "upload file",
+        "attach resume",
+    }
+)
+
+_FALLBACK_APPLY_KEYWORDS = ("apply", "application", "candidature")
+_FALLBACK_PROGRESSION_KEYWORDS = ("next", "continue", "submit", "proceed", "review")
+_FALLBACK_LOGIN_KEYWORDS = ("sign in", "log in", "login", "authenticate")
+_FALLBACK_UPLOAD_KEYWORDS = ("upload", "attach", "resume", "cv", "file")
+# 兜底规则分组 -> 意图；一次扫描得到全部命中分组
+_FALLBACK_GROUP_INTENTS: dict[str, tuple[str, ...]] = {
+    "apply": ("apply_entry", "progression_action"),
+    "progression": ("progression_action",),
+    "login": ("login_action",),
+    "upload": ("upload_request",),
 }
-ALLOWED_TEXT_INTENTS = {"login_action", "upload_request"}
+_FALLBACK_KEYWORD_RE, _FALLBACK_KEYWORD_OWNERS = compile_keyword_index(
+    (
+        ("apply", _FALLBACK_APPLY_KEYWORDS),
+        ("progression", _FALLBACK_PROGRESSION_KEYWORDS),
+        ("login", _FALLBACK_LOGIN_KEYWORDS),
+        ("upload", _FALLBACK_UPLOAD_KEYWORDS),
+    )
+)
+
 
+def intent_cache_key(
+    labels: list[str],
+    context: str | PageTextView = "",
+) -> str:
+    # 逐条喂入 hasher，避免 join 出整段中间字符串；
+    # 上下文以前缀摘要参与，PageTextView 可复用已算好的摘要
+    hasher = hashlib.sha1()
+    for label in sorted(labels):
+        hasher.update(label.encode("utf-8"))
+        hasher.update(b"\n")
+    hasher.update(b"--ctx--\n")
+    if isinstance(context, PageTextView):
+        hasher.update(context.prefix_digest(600))
+    else:
+        hasher.update(text_digest(context[:600]))
+    return f"labels::{hasher.hexdigest()}"
 
-def intent_cache_key(labels: list[str], context: str = "") -> str:
-    stable = "\n".join(sorted(labels))
-    base = f"{stable}\n--ctx--\n{context[:600]}"
-    return f"labels::{hashlib.sha1(base.encode('utf-8')).hexdigest()}"
+
+def is_locally_settled_label(label: str) -> bool:
+    """常见无歧义文案（Apply/Next/Sign in/Upload CV 等）可跳过 LLM。"""
+    return " ".join((label or "").lower().split()) in _LOCALLY_SETTLED_LABELS
 
 
 def fallback_label_intents(label: str) -> set[str]:
     """当语义模型不可用时，使用极小硬规则集合兜底。"""
-    text = (label or "").strip().lower()
-    intents: set[str] = set()
+    return set(_fallback_label_intents_cached((label or "").strip().lower()))
+
+
+@lru_cache(maxsize=1024)
+def _fallback_label_intents_cached(text: str) -> frozenset[str]:
+    # 按钮文案高度重复，按归一化文本缓存；返回 frozenset 防止共享结果被改写
     if not text:
-        return intents
-
-    if any(k in text for k in ["apply", "application", "candidature"]):
-        intents.add("apply_entry")
-        intents.add("progression_action")
-    if any(k in text for k in ["next", "continue", "submit", "proceed", "review"]):
-        intents.add("progression_action")
-    if any(k in text for k in ["sign in", "log in", "login", "authenticate"]):
-        intents.add("login_action")
-    if any(k in text for k in ["upload", "attach", "resume", "cv", "file"]):
-        intents.add("upload_request")
-    return intents
+        return frozenset()
+    groups = matched_groups(_FALLBACK_KEYWORD_RE, _FALLBACK_KEYWORD_OWNERS, text)
+    return frozenset(
+        intent for group in groups for intent in _FALLBACK_GROUP_INTENTS[group]
+    )
 
 
 def infer_snapshot_intents(
     snapshot_map: dict[str, SnapshotItem],
-    visible_text: str,
+    visible_text: str | PageTextView,
     *,
     infer_label_intents_fn,
 ) -> dict[str, set[str]]:
@@ -70,7 +132,9 @@ def infer_snapshot_intents(
 
     label_intents = infer_label_intents_fn(
         list(ref_to_label.values()),
-        context=visible_text[:800],
+        context=visible_text
+        if isinstance(visible_text, PageTextView)
+        else visible_text[:800],
     )
     ref_intents: dict[str, set[str]] = {}
     for ref, label in ref_to_label.items():
@@ -81,13 +145,13 @@ def infer_snapshot_intents(
 def infer_label_intents(
     labels: list[str],
     *,
-    context: str = "",
+    context: str | PageTextView = "",
     intent_cache: dict[str, dict[str, list[str]]],
     infer_label_intents_with_llm_fn,
 ) -> dict[str, set[str]]:
     """
     对一组 UI 文本做语义意图分类。
-    优先使用低成本文本模型，失败回退到强共识关键词。
+    常见无歧义文案本地定案；其余优先使用低成本文本模型，失败回退到强共识关键词。
     """
     cleaned = []
     seen = set()
@@ -105,13 +169,22 @@ def infer_label_intents(
     if cached is not None:
         return {k: set(v) for k, v in cached.items()}
 
-    result = infer_label_intents_with_llm_fn(cleaned, context)
+    if isinstance(context, PageTextView):
+        context = context.prefix(800)
+
+    settled = {
+        label: fallback_label_intents(label)
+        for label in cleaned
+        if is_locally_settled_label(label)
+    }
+    pending = [label for label in cleaned if label not in settled]
+    result = infer_label_intents_with_llm_fn(pending, context) if pending else {}
     if result is None:
-        result = {label: fallback_label_intents(label) for label in cleaned}
+        result = {label: fallback_label_intents(label) for label in pending}
     else:
-        for label in cleaned:
+        for label in pending:
             result.setdefault(label, fallback_label_intents(label))
-
+    result.update(settled)
     intent_cache[cache_key] = {k: sorted(v) for k, v in result.items()}
     return result
 
@@ -176,15 +249,16 @@ def infer_label_intents_with_llm(
             intents = item.get("intents", [])
             if not isinstance(intents, list):
                 continue
-            normalized = {str(x).strip() for x in intents}
-            out[text].update(i for i in normalized if i in ALLOWED_LABEL_INTENTS)
+            out[text].update(
+                s for x in intents if (s := str(x).strip()) in ALLOWED_LABEL_INTENTS
+            )
         return out
     except Exception:
         return None
 
 
 def infer_text_intents(
-    text: str,
+    text: str | PageTextView,
     *,
     limit: int = 1200,
     intent_cache: dict[str, dict[str, list[str]]],
@@ -196,11 +270,11 @@ def infer_text_intents(
     对整页文本做语义意图分类（低频、可缓存）。
     只输出少量全局意图。
     """
-    snippet = (text or "").strip()
+    page_text = as_page_text_view(text)
+    snippet = page_text.prefix(limit, strip=True)
     if not snippet:
         return set()
-    snippet = snippet[:limit]
-    cache_key = f"text::{hashlib.sha1(snippet.encode('utf-8')).hexdigest()}"
+    cache_key = f"text::{page_text.prefix_digest(limit, strip=True).hex()}"
     cached = intent_cache.get(cache_key)
     if cached is not None:
         intents = cached.get("__text__", [])
@@ -236,9 +310,9 @@ def infer_text_intents(
             data = safe_parse_json_fn(raw)
             if data and isinstance(data.get("intents"), list):
                 intents = {
-                    str(x).strip()
+                    s
                     for x in data["intents"]
-                    if str(x).strip() in ALLOWED_TEXT_INTENTS
+                    if (s := str(x).strip()) in ALLOWED_TEXT_INTENTS
                 }
         except Exception:
             intents = set()
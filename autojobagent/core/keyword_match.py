@@ -0,0 +1,59 @@
+"""
+关键词匹配辅助模块（V2 拆分）
+
+职责：
+- 把固定短语集合编译为单个正则交替式，一次扫描判断是否命中
+- 多组关键词索引：一次扫描得到所有命中分组，结果与逐词 `in` 判断一致
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Iterable
+
+
+def phrase_pattern(
+    phrases: Iterable[str], *, ignore_case: bool = True
+) -> re.Pattern[str]:
+    """把短语集合编译为单个正则交替式（一次 C 层扫描，忽略大小写时无需 lower 拷贝）。"""
+    flags = re.IGNORECASE if ignore_case else 0
+    return re.compile("|".join(map(re.escape, phrases)), flags)
+
+
+def compile_keyword_index(
+    groups: Iterable[tuple[str, Iterable[str]]],
+) -> tuple[re.Pattern[str], dict[str, frozenset[str]]]:
+    """
+    把 (group_id, keywords) 编译为一个多模式匹配器。
+
+    前瞻交替式（长词优先）在每个位置报告最长命中词；每个关键词映射到
+    所有以其前缀为关键词的分组，因此命中集合与逐词 `in` 判断完全一致。
+    """
+    owners: dict[str, set[str]] = {}
+    for group_id, keywords in groups:
+        for kw in keywords:
+            owners.setdefault(kw, set()).add(group_id)
+    expanded = {
+        kw: frozenset(
+            gid
+            for other, gids in owners.items()
+            if kw.startswith(other)
+            for gid in gids
+        )
+        for kw in owners
+    }
+    alternation = "|".join(
+        re.escape(kw) for kw in sorted(owners, key=len, reverse=True)
+    )
+    return re.compile(f"(?=({alternation}))"), expanded
+
+
+def matched_groups(
+    pattern: re.Pattern[str],
+    owners: dict[str, frozenset[str]],
+    text: str,
+) -> set[str]:
+    hits: set[str] = set()
+    for match in pattern.finditer(text):
+        hits |= owners[match.group(1)]
+    return hits
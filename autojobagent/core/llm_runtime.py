@@ -9,12 +9,21 @@ LLM 调用运行时（V2 拆分）
 
 from __future__ import annotations
 
+import re
 import time
 from dataclasses import dataclass
 from typing import Callable
 
+# 错误分类：限流 / 模型能力不匹配（单次 C 层扫描，无需 lower 拷贝）
+_RATE_LIMIT_RE = re.compile(r"429|rate[_ ]limit", re.IGNORECASE)
+_CAPABILITY_MISMATCH_RE = re.compile(
+    r"does not support|unsupported|multimodal|vision|image_url"
+    r"|invalid model|model_not_found|not found",
+    re.IGNORECASE,
+)
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class LLMCallResult:
     ok: bool
     raw: str = ""
@@ -24,6 +33,77 @@ class LLMCallResult:
     error_code: str | None = None
 
 
+def _classify_error(exc: Exception) -> str:
+    """返回 rate_limit / capability_mismatch / other。"""
+    error_str = str(exc)
+    if _RATE_LIMIT_RE.search(error_str) is not None:
+        return "rate_limit"
+    if _CAPABILITY_MISMATCH_RE.search(error_str) is not None:
+        return "capability_mismatch"
+    return "other"
+
+
+def _failure_result(
+    kind: str, model: str, model_index: int, exc: Exception
+) -> LLMCallResult:
+    if kind == "rate_limit":
+        return LLMCallResult(
+            ok=False,
+            model=model,
+            model_index=model_index,
+            error_summary="所有模型都遇到速率限制",
+            error_code="rate_limit_exhausted",
+        )
+    if kind == "capability_mismatch":
+        return LLMCallResult(
+            ok=False,
+            model=model,
+            model_index=model_index,
+            error_summary="所有候选模型都不支持当前请求",
+            error_code="model_unsupported_exhausted",
+        )
+    return LLMCallResult(
+        ok=False,
+        model=model,
+        model_index=model_index,
+        error_summary=f"LLM 调用失败: {exc}",
+        error_code="llm_call_failed",
+    )
+
+
+def _no_result(fallback_models: list[str]) -> LLMCallResult:
+    return LLMCallResult(
+        ok=False,
+        model=fallback_models[-1] if fallback_models else "",
+        model_index=max(0, len(fallback_models) - 1),
+        error_summary="LLM 未返回结果",
+        error_code="llm_no_result",
+    )
+
+
+def _start_index(start_model_index: int, fallback_models: list[str]) -> int:
+    model_index = max(0, int(start_model_index))
+    if model_index >= len(fallback_models):
+        model_index = 0
+    return model_index
+
+
+def _log_switch(
+    on_log: Callable[[str, str], None] | None,
+    kind: str,
+    model: str,
+    next_model: str | None,
+) -> None:
+    if not on_log:
+        return
+    if kind == "rate_limit":
+        on_log("warn", f"⚠️ 模型 {model} 遇到速率限制")
+    else:
+        on_log("warn", f"⚠️ 模型 {model} 能力不匹配或不可用，尝试回退")
+    if next_model:
+        on_log("info", f"🔄 切换到模型: {next_model}")
+
+
 def run_chat_with_fallback(
     *,
     client,
@@ -38,17 +118,11 @@ def run_chat_with_fallback(
 ) -> LLMCallResult:
     """
     在候选模型列表上执行回退调用。
-    - 限流或能力不匹配：尝试切换到下一模型
+    - 限流或能力不匹配：短暂停顿后切换到下一模型
+      （各模型限流独立，不等待上一模型的 Retry-After）
     - 其他错误：立即失败返回
     """
-    model_index = max(0, int(start_model_index))
-    if model_index >= len(fallback_models):
-        model_index = 0
-
-    def _log(level: str, message: str) -> None:
-        if on_log:
-            on_log(level, message)
-
+    model_index = _start_index(start_model_index, fallback_models)
     while model_index < len(fallback_models):
         model = fallback_models[model_index]
         try:
@@ -67,65 +141,18 @@ def run_chat_with_fallback(
                 model_index=model_index,
             )
         except Exception as exc:
-            error_str = str(exc)
-            error_lower = error_str.lower()
-            is_rate_limit = "429" in error_str or "rate_limit" in error_lower
-            is_capability_mismatch = any(
-                kw in error_lower
-                for kw in (
-                    "does not support",
-                    "unsupported",
-                    "multimodal",
-                    "vision",
-                    "image_url",
-                    "invalid model",
-                    "model_not_found",
-                    "not found",
-                )
+            kind = _classify_error(exc)
+            if kind == "other":
+                return _failure_result(kind, model, model_index, exc)
+            model_index += 1
+            next_model = (
+                fallback_models[model_index]
+                if model_index < len(fallback_models)
+                else None
             )
+            _log_switch(on_log, kind, model, next_model)
+            if next_model is None:
+                return _failure_result(kind, model, model_index, exc)
+            time.sleep(max(0.0, sleep_seconds))
 
-            if is_rate_limit:
-                _log("warn", f"⚠️ 模型 {model} 遇到速率限制")
-                model_index += 1
-                if model_index < len(fallback_models):
-                    _log("info", f"🔄 切换到模型: {fallback_models[model_index]}")
-                    time.sleep(max(0.0, sleep_seconds))
-                    continue
-                return LLMCallResult(
-                    ok=False,
-                    model=model,
-                    model_index=model_index,
-                    error_summary="所有模型都遇到速率限制",
-                    error_code="rate_limit_exhausted",
-                )
-
-            if is_capability_mismatch:
-                _log("warn", f"⚠️ 模型 {model} 能力不匹配或不可用，尝试回退")
-                model_index += 1
-                if model_index < len(fallback_models):
-                    _log("info", f"🔄 切换到模型: {fallback_models[model_index]}")
-                    time.sleep(max(0.0, sleep_seconds))
-                    continue
-                return LLMCallResult(
-                    ok=False,
-                    model=model,
-                    model_index=model_index,
-                    error_summary="所有候选模型都不支持当前请求",
-                    error_code="model_unsupported_exhausted",
-                )
-
-            return LLMCallResult(
-                ok=False,
-                model=model,
-                model_index=model_index,
-                error_summary=f"LLM 调用失败: {exc}",
-                error_code="llm_call_failed",
-            )
-
-    return LLMCallResult(
-        ok=False,
-        model=fallback_models[-1] if fallback_models else "",
-        model_index=max(0, len(fallback_models) - 1),
-        error_summary="LLM 未返回结果",
-        error_code="llm_no_result",
-    )
+    return _no_result(fallback_models)
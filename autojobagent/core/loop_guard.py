@@ -9,14 +9,18 @@
 
 from __future__ import annotations
 
+from functools import lru_cache
 from urllib.parse import urlsplit
 
+_UNSTABLE_PATH_PARTS = frozenset({"jobs", "job"})
 
+
+@lru_cache(maxsize=256)
 def stable_page_scope(current_url: str) -> str:
     parsed = urlsplit(current_url or "")
     domain = (parsed.netloc or "unknown").lower()
     path = (parsed.path or "/").lower()
-    stable_parts = [p for p in path.split("/") if p and p not in {"jobs", "job"}]
+    stable_parts = [p for p in path.split("/") if p and p not in _UNSTABLE_PATH_PARTS]
     normalized_path = "/" + "/".join(stable_parts[:3]) if stable_parts else "/"
     return f"{domain}{normalized_path}"
 
@@ -47,9 +51,12 @@ def record_loop_action_result(
     success: bool,
 ) -> None:
     if success:
-        action_fail_counts[action_key] = 0
-        repeated_skip_counts[action_key] = 0
-        if semantic_key:
+        # 仅在计数非零时回写，避免每步对已归零的 key 重复赋值
+        if action_fail_counts.get(action_key):
+            action_fail_counts[action_key] = 0
+        if repeated_skip_counts.get(action_key):
+            repeated_skip_counts[action_key] = 0
+        if semantic_key and semantic_fail_counts.get(semantic_key):
             semantic_fail_counts[semantic_key] = 0
         return
     action_fail_counts[action_key] = action_fail_counts.get(action_key, 0) + 1
@@ -8,18 +8,33 @@ Goal:
 
 from __future__ import annotations
 
-from dataclasses import dataclass, field
-from typing import Any
-
+import re
+import threading
+from dataclasses import dataclass, field, replace
+from functools import lru_cache
+from itertools import islice
+from typing import Any, Iterable
+
+from .keyword_match import compile_keyword_index, matched_groups, phrase_pattern
 from .semantic_tree import QuestionBlock
 from .ui_snapshot import SnapshotItem
 
+_WS_RE = re.compile(r"\s+")
+# Anything other than single ASCII spaces between words needs collapsing.
+_WS_IRREGULAR_RE = re.compile(r"\s{2,}|[^\S ]")
+
 
+@lru_cache(maxsize=4096)
 def _norm(text: str | None) -> str:
-    return " ".join((text or "").split()).strip().lower()
+    if not text:
+        return ""
+    t = text.strip()
+    if _WS_IRREGULAR_RE.search(t) is None:
+        return t.casefold()
+    return _WS_RE.sub(" ", t).casefold()
 
 
-def _contains_any(text: str, keywords: list[str]) -> bool:
+def _contains_any(text: str, keywords: Iterable[str]) -> bool:
     return any(k in text for k in keywords)
 
 
@@ -27,7 +42,7 @@ def _city_seed(text: str | None) -> str:
     value = _norm(text)
     if not value:
         return ""
-    return value.split(",")[0].strip()
+    return value.partition(",")[0].strip()
 
 
 def _get_path(data: dict, path: tuple[str, ...], default: Any = None) -> Any:
@@ -59,31 +74,37 @@ def _to_bool(value: Any) -> bool | None:
     return None
 
 
-def _match_option_text(options: list[str], wanted: str) -> str | None:
+def _match_option_text(
+    options: list[str],
+    options_norm: list[str],
+    wanted: str,
+) -> str | None:
     w = _norm(wanted)
     if not w:
         return None
-    exact = [opt for opt in options if _norm(opt) == w]
-    if exact:
-        return exact[0]
-    starts = [opt for opt in options if _norm(opt).startswith(w)]
-    if starts:
-        return starts[0]
-    contains = [opt for opt in options if w in _norm(opt) or _norm(opt) in w]
-    if contains:
-        return contains[0]
-    return None
+    # Single pass: exact match wins immediately; otherwise the first prefix
+    # match beats the first containment match.
+    first_starts = first_contains = None
+    for opt, n in zip(options, options_norm):
+        if n == w:
+            return opt
+        if first_starts is None and n.startswith(w):
+            first_starts = opt
+        if first_contains is None and (w in n or n in w):
+            first_contains = opt
+    return first_starts if first_starts is not None else first_contains
 
 
 def _match_preferred_locations(
     *,
     question_options: list[str],
+    options_norm: list[str],
     preferred_locations: list[str],
 ) -> list[str]:
     if not question_options or not preferred_locations:
         return []
     matched: list[str] = []
-    option_norm_map = {_norm(opt): opt for opt in question_options}
+    option_norm_map = dict(zip(options_norm, question_options))
     for raw_pref in preferred_locations:
         pref = _city_seed(raw_pref)
         if not pref:
@@ -128,18 +149,30 @@ _NEUTRAL_OPTION_CUES = [
 ]
 
 
-def _option_polarity(option: str) -> str | None:
-    n = _norm(option)
+_EXACT_POSITIVE_OPTIONS = frozenset(("yes", "y", "true"))
+_EXACT_NEGATIVE_OPTIONS = frozenset(("no", "n", "false"))
+_NEUTRAL_CUE_RE = phrase_pattern(_NEUTRAL_OPTION_CUES, ignore_case=False)
+# Scores count distinct cues present (overlaps included, e.g. "do not" also
+# contains "no" and "not"), so use the keyword index rather than findall().
+_POSITIVE_CUE_RE, _POSITIVE_CUE_OWNERS = compile_keyword_index(
+    (cue, (cue,)) for cue in _POSITIVE_OPTION_CUES
+)
+_NEGATIVE_CUE_RE, _NEGATIVE_CUE_OWNERS = compile_keyword_index(
+    (cue, (cue,)) for cue in _NEGATIVE_OPTION_CUES
+)
+
+
+def _option_polarity_from_norm(n: str) -> str | None:
     if not n:
         return None
-    if n in ("yes", "y", "true"):
+    if n in _EXACT_POSITIVE_OPTIONS:
         return "positive"
-    if n in ("no", "n", "false"):
+    if n in _EXACT_NEGATIVE_OPTIONS:
         return "negative"
-    if _contains_any(n, _NEUTRAL_OPTION_CUES):
+    if _NEUTRAL_CUE_RE.search(n) is not None:
         return "neutral"
-    pos = sum(1 for k in _POSITIVE_OPTION_CUES if k in n)
-    neg = sum(1 for k in _NEGATIVE_OPTION_CUES if k in n)
+    pos = len(matched_groups(_POSITIVE_CUE_RE, _POSITIVE_CUE_OWNERS, n))
+    neg = len(matched_groups(_NEGATIVE_CUE_RE, _NEGATIVE_CUE_OWNERS, n))
     if pos > neg and pos > 0:
         return "positive"
     if neg > pos and neg > 0:
@@ -147,13 +180,18 @@ def _option_polarity(option: str) -> str | None:
     return None
 
 
-def _pick_boolean_option(options: list[str], desired: bool) -> str | None:
-    direct = _match_option_text(options, "yes" if desired else "no")
+def _pick_boolean_option(
+    options: list[str],
+    options_norm: list[str],
+    polarity: list[str | None],
+    desired: bool,
+) -> str | None:
+    direct = _match_option_text(options, options_norm, "yes" if desired else "no")
     if direct:
         return direct
     target = "positive" if desired else "negative"
-    for option in options:
-        if _option_polarity(option) == target:
+    for option, option_polarity in zip(options, polarity):
+        if option_polarity == target:
             return option
     return None
 
@@ -170,15 +208,19 @@ def _alias_candidates(value: str, aliases: dict[str, list[str]]) -> list[str]:
     return [x for x in out if _norm(x)]
 
 
-def _pick_by_candidates(options: list[str], candidates: list[str]) -> str | None:
+def _pick_by_candidates(
+    options: list[str],
+    options_norm: list[str],
+    candidates: list[str],
+) -> str | None:
     for candidate in candidates:
-        hit = _match_option_text(options, candidate)
+        hit = _match_option_text(options, options_norm, candidate)
         if hit:
             return hit
     return None
 
 
-@dataclass
+@dataclass(slots=True)
 class MacroTask:
     task_id: str
     task_type: str  # combobox_select | question_single | question_multi
@@ -195,7 +237,7 @@ class MacroTask:
     retry_count: int = 0
 
 
-@dataclass(frozen=True)
+@dataclass(slots=True, frozen=True)
 class MappingRule:
     rule_id: str
     keywords: tuple[str, ...]
@@ -308,17 +350,35 @@ _MAPPING_RULES: tuple[MappingRule, ...] = (
 )
 
 
+_RULES_BY_ID: dict[str, MappingRule] = {rule.rule_id: rule for rule in _MAPPING_RULES}
+_RULE_ORDER: dict[str, int] = {rule.rule_id: i for i, rule in enumerate(_MAPPING_RULES)}
+_RULE_KEYWORD_RE, _RULE_KEYWORD_OWNERS = compile_keyword_index(
+    # Normalize once at import so keywords fold exactly like _norm(question).
+    (rule.rule_id, tuple(_norm(kw) for kw in rule.keywords))
+    for rule in _MAPPING_RULES
+)
+
+
 def _resolve_rule_mapping(
     *,
     question_text: str,
     options: list[str],
-    profile: dict,
+    options_norm: list[str],
+    polarity: list[str | None],
+    rule_values: dict[str, Any],
 ) -> tuple[list[str], str | None]:
     lower_q = _norm(question_text)
-    for rule in _MAPPING_RULES:
-        if not _contains_any(lower_q, list(rule.keywords)):
-            continue
-        raw_value = _get_path(profile, rule.profile_path, None)
+    # One scan over the question finds every rule with a keyword hit.
+    hit_ids = matched_groups(_RULE_KEYWORD_RE, _RULE_KEYWORD_OWNERS, lower_q)
+    if not hit_ids:
+        return [], None
+    # Boolean picks depend only on the options and the desired value, so each
+    # side is resolved at most once per question however many bool rules hit.
+    boolean_picks: dict[bool, str | None] = {}
+    # Visit only the hit rules, still in declaration (priority) order.
+    for rule_id in sorted(hit_ids, key=_RULE_ORDER.__getitem__):
+        rule = _RULES_BY_ID[rule_id]
+        raw_value = rule_values.get(rule_id)
         if raw_value is None:
             continue
 
@@ -326,7 +386,11 @@ def _resolve_rule_mapping(
             desired = _to_bool(raw_value)
             if desired is None:
                 continue
-            hit = _pick_boolean_option(options, desired)
+            if desired not in boolean_picks:
+                boolean_picks[desired] = _pick_boolean_option(
+                    options, options_norm, polarity, desired
+                )
+            hit = boolean_picks[desired]
             if hit:
                 return [hit], rule.rule_id
             continue
@@ -336,7 +400,7 @@ def _resolve_rule_mapping(
             if not value:
                 continue
             candidates = _alias_candidates(value, rule.aliases)
-            hit = _pick_by_candidates(options, candidates)
+            hit = _pick_by_candidates(options, options_norm, candidates)
             if hit:
                 return [hit], rule.rule_id
             continue
@@ -345,7 +409,7 @@ def _resolve_rule_mapping(
             wanted_values = _as_text_list(raw_value)
             picked: list[str] = []
             for wanted in wanted_values:
-                hit = _match_option_text(options, wanted)
+                hit = _match_option_text(options, options_norm, wanted)
                 if hit and hit not in picked:
                     picked.append(hit)
             if picked:
@@ -358,6 +422,7 @@ def _resolve_custom_option_rules(
     *,
     question_text: str,
     options: list[str],
+    options_norm: list[str],
     profile: dict,
 ) -> tuple[list[str], str | None]:
     raw_rules = profile.get("option_rules", []) if isinstance(profile, dict) else []
@@ -368,7 +433,7 @@ def _resolve_custom_option_rules(
         if not isinstance(rule, dict):
             continue
         keywords_raw = rule.get("question_keywords", [])
-        keywords = [str(x).strip().lower() for x in keywords_raw if str(x).strip()]
+        keywords = tuple(k for x in keywords_raw if (k := _norm(str(x))))
         if keywords and not _contains_any(lower_q, keywords):
             continue
         answers = _as_text_list(rule.get("answers", []))
@@ -378,7 +443,7 @@ def _resolve_custom_option_rules(
             continue
         picked: list[str] = []
         for wanted in answers:
-            hit = _match_option_text(options, wanted)
+            hit = _match_option_text(options, options_norm, wanted)
             if hit and hit not in picked:
                 picked.append(hit)
         if picked:
@@ -386,14 +451,29 @@ def _resolve_custom_option_rules(
     return [], None
 
 
+_OFFICE_QUESTION_KEYWORDS = ("which office", "willing to work out of", "work out of")
+
+
+def _profile_rule_values(profile: dict) -> dict[str, Any]:
+    """Walk each built-in rule's profile path once per build, not per question."""
+    return {
+        rule_id: _get_path(profile, rule.profile_path, None)
+        for rule_id, rule in _RULES_BY_ID.items()
+    }
+
+
 def _resolve_question_mapping(
     *,
     qb: QuestionBlock,
     profile: dict,
+    rule_values: dict[str, Any],
 ) -> tuple[list[str], str | None]:
     options = [opt.text for opt in qb.options if opt.text]
     if not options:
         return [], None
+    # Normalize options and score polarity once per question; rules reuse them.
+    options_norm = [_norm(opt) for opt in options]
+    polarity = [_option_polarity_from_norm(n) for n in options_norm]
 
     lower_q = _norm(qb.question_text)
     work_pref = profile.get("work_preferences", {}) if isinstance(profile, dict) else {}
@@ -404,11 +484,10 @@ def _resolve_question_mapping(
     )
 
     # Priority 1: office-like multi-selection questions
-    if _contains_any(
-        lower_q, ["which office", "willing to work out of", "work out of"]
-    ):
+    if _contains_any(lower_q, _OFFICE_QUESTION_KEYWORDS):
         expected = _match_preferred_locations(
             question_options=options,
+            options_norm=options_norm,
             preferred_locations=preferred_locations,
         )
         if expected:
@@ -418,7 +497,9 @@ def _resolve_question_mapping(
     expected, reason = _resolve_rule_mapping(
         question_text=qb.question_text,
         options=options,
-        profile=profile,
+        options_norm=options_norm,
+        polarity=polarity,
+        rule_values=rule_values,
     )
     if expected:
         return expected, reason
@@ -427,6 +508,7 @@ def _resolve_question_mapping(
     expected, reason = _resolve_custom_option_rules(
         question_text=qb.question_text,
         options=options,
+        options_norm=options_norm,
         profile=profile,
     )
     if expected:
@@ -435,11 +517,73 @@ def _resolve_question_mapping(
     return [], None
 
 
+_MACRO_CACHE_MAX = 64
+# fingerprint -> (profile, tasks). The profile object is kept so an id() reused
+# after garbage collection can never alias a different profile.
+_MACRO_CACHE: dict[tuple, tuple[Any, list[MacroTask]]] = {}
+# Pool workers share the cache; guard lookup and insert/evict, build unlocked.
+_MACRO_CACHE_LOCK = threading.Lock()
+
+
+def _clone_tasks(tasks: list[MacroTask]) -> list[MacroTask]:
+    # Callers mutate status/retry_count, so hand out fresh task objects.
+    return [
+        replace(task, expected_options=list(task.expected_options)) for task in tasks
+    ]
+
+
+def _macro_fingerprint(
+    profile: dict,
+    snapshot_map: dict[str, SnapshotItem],
+    question_blocks: list[QuestionBlock],
+) -> tuple:
+    combo = next(
+        (it for it in snapshot_map.values() if it.role == "combobox"),
+        None,
+    )
+    return (
+        id(profile),
+        (combo.ref, combo.name) if combo is not None else None,
+        tuple(
+            (
+                qb.question_text,
+                tuple((opt.text, opt.role) for opt in qb.options),
+            )
+            for qb in question_blocks
+        ),
+    )
+
+
 def build_macro_tasks(
     *,
     profile: dict,
     snapshot_map: dict[str, SnapshotItem],
     question_blocks: list[QuestionBlock],
+) -> list[MacroTask]:
+    fingerprint = _macro_fingerprint(profile, snapshot_map, question_blocks)
+    with _MACRO_CACHE_LOCK:
+        cached = _MACRO_CACHE.get(fingerprint)
+    if cached is not None and cached[0] is profile:
+        return _clone_tasks(cached[1])
+
+    tasks = _build_macro_tasks(
+        profile=profile,
+        snapshot_map=snapshot_map,
+        question_blocks=question_blocks,
+    )
+    entry = (profile, _clone_tasks(tasks))
+    with _MACRO_CACHE_LOCK:
+        if fingerprint not in _MACRO_CACHE and len(_MACRO_CACHE) >= _MACRO_CACHE_MAX:
+            _MACRO_CACHE.pop(next(iter(_MACRO_CACHE)))
+        _MACRO_CACHE[fingerprint] = entry
+    return tasks
+
+
+def _build_macro_tasks(
+    *,
+    profile: dict,
+    snapshot_map: dict[str, SnapshotItem],
+    question_blocks: list[QuestionBlock],
 ) -> list[MacroTask]:
     tasks: list[MacroTask] = []
     task_idx = 1
@@ -470,8 +614,11 @@ def build_macro_tasks(
             task_idx += 1
 
     # 2) Question tasks from semantic blocks (generalized option mapper)
+    rule_values = _profile_rule_values(profile) if question_blocks else {}
     for qb in question_blocks:
-        expected, reason = _resolve_question_mapping(qb=qb, profile=profile)
+        expected, reason = _resolve_question_mapping(
+            qb=qb, profile=profile, rule_values=rule_values
+        )
         if not expected:
             continue
         option_roles = {(_norm(opt.role) or "button") for opt in qb.options}
@@ -495,8 +642,9 @@ def build_macro_tasks(
 
 
 def summarize_macro_tasks(tasks: list[MacroTask]) -> list[str]:
+    # Each task yields exactly one line, so only the first 10 are formatted.
     out: list[str] = []
-    for task in tasks:
+    for task in islice(tasks, 10):
         status = task.status
         if task.task_type == "combobox_select":
             out.append(
@@ -507,4 +655,4 @@ def summarize_macro_tasks(tasks: list[MacroTask]) -> list[str]:
             out.append(
                 f"{task.task_id}:{status}: {task.question_text or task.title} -> {', '.join(task.expected_options[:4])}{reason}"
             )
-    return out[:10]
+    return out
@@ -8,8 +8,31 @@
 
 from __future__ import annotations
 
+import re
+
+from .keyword_match import phrase_pattern
+from .page_text import PageTextView, as_page_text_view
 from .ui_snapshot import SnapshotItem
 
+_CAPTCHA_PHRASE_RE = phrase_pattern(
+    (
+        "i am not a robot",
+        "verify you are human",
+        "security check",
+        "complete the challenge",
+        "select all images",
+        "are you human",
+    )
+)
+
+# Apply 入口候选中需排除的非申请按钮（替换简历/上传/自动填充/设置等）
+_BAD_APPLY_LABEL_RE = re.compile(
+    r"replace|upload|autofill|tailor|settings|profile|close", re.IGNORECASE
+)
+
+_BUTTON_LIKE_ROLES = frozenset(("button", "link"))
+_APPLICATION_URL_RE = re.compile(r"/application|/apply", re.IGNORECASE)
+
 
 def safe_locator_count(page, selector: str) -> int:
     try:
@@ -18,88 +41,146 @@ def safe_locator_count(page, selector: str) -> int:
         return 0
 
 
-def collect_selector_details(page, selectors: list[str]) -> dict[str, dict]:
-    out: dict[str, dict] = {}
-    for selector in selectors:
+# 页面侧验证码探测函数：一次遍历全部选择器，同时返回可见挑战节点数与调试样本
+_CAPTCHA_PROBE_JS = """
+(selectors) => {
+  const isVisible = (el) => {
+    const st = window.getComputedStyle(el);
+    if (!st) return false;
+    if (st.display === "none" || st.visibility === "hidden") return false;
+    const r = el.getBoundingClientRect();
+    return r.width > 0 && r.height > 0;
+  };
+  const isLegalNotice = (el) => {
+    const cls = String(el.className || "").toLowerCase();
+    const text = String(el.textContent || "").toLowerCase();
+    return (
+      cls.includes("recaptchalegal") ||
+      (text.includes("protected by recaptcha") &&
+       text.includes("privacy policy") &&
+       text.includes("terms of service"))
+    );
+  };
+  return selectors.map((sel) => {
+    let nodes;
+    try {
+      nodes = Array.from(document.querySelectorAll(sel));
+    } catch (e) {
+      return { error: String(e) };
+    }
+    let count = 0;
+    const samples = [];
+    nodes.forEach((el, i) => {
+      const visible = isVisible(el);
+      if (visible && !isLegalNotice(el)) count += 1;
+      if (i < 3) {
+        const r = el.getBoundingClientRect();
+        samples.push({
+          tag: (el.tagName || "").toLowerCase(),
+          id: el.id || "",
+          className: String(el.className || "").slice(0, 80),
+          text: String(el.textContent || "").trim().slice(0, 120),
+          visible,
+          rect: { w: Math.round(r.width), h: Math.round(r.height) },
+        });
+      }
+    });
+    return {
+      count,
+      total: nodes.length,
+      visible: samples.filter((s) => s.visible).length,
+      samples,
+    };
+  });
+}
+"""
+
+# 与 dom_extract 相同的安装方式：Symbol.for 键不会与页面自身的全局变量冲突
+_INSTALL_KEY_JS = 'Symbol.for("autojobagent.captchaProbe")'
+
+# 已安装时直接调用；未安装（init script 之前创建的文档）返回 null 由调用方回退
+_CAPTCHA_PROBE_CALL_JS = (
+    "(sels) => { const fn = window[" + _INSTALL_KEY_JS + "];"
+    " return fn ? fn(sels) : null; }"
+)
+
+# 回退路径：发送完整脚本，安装到当前文档后执行，同一文档后续调用走短脚本
+_CAPTCHA_PROBE_INSTALL_JS = (
+    "(sels) => { const fn = "
+    + _CAPTCHA_PROBE_JS
+    + "; window["
+    + _INSTALL_KEY_JS
+    + "] = fn; return fn(sels); }"
+)
+
+# 供 BrowserContext.add_init_script 使用：每个新文档创建时预先安装
+CAPTCHA_PROBE_INIT_SCRIPT = (
+    "window[" + _INSTALL_KEY_JS + "] = " + _CAPTCHA_PROBE_JS + ";"
+)
+
+
+def probe_captcha_selectors(page, selectors: list[str]) -> tuple[int, dict[str, dict]]:
+    """
+    单次 page.evaluate 探测验证码选择器。
+    返回 (可见挑战节点总数, 每个选择器的调试详情)；
+    计数排除 recaptcha 法律声明文本。
+    """
+    if not selectors:
+        return 0, {}
+    try:
+        results = page.evaluate(_CAPTCHA_PROBE_CALL_JS, list(selectors))
+        if results is None:
+            results = page.evaluate(_CAPTCHA_PROBE_INSTALL_JS, list(selectors))
+    except Exception as exc:
+        return 0, {selector: {"error": str(exc)} for selector in selectors}
+
+    total = 0
+    details: dict[str, dict] = {}
+    for selector, result in zip(selectors, results or []):
+        if not isinstance(result, dict):
+            details[selector] = {"error": "invalid probe result"}
+            continue
+        result = dict(result)
         try:
-            details = page.evaluate(
-                """
-                (sel) => {
-                  const nodes = Array.from(document.querySelectorAll(sel));
-                  const isVisible = (el) => {
-                    const st = window.getComputedStyle(el);
-                    if (!st) return false;
-                    if (st.display === "none" || st.visibility === "hidden") return false;
-                    const r = el.getBoundingClientRect();
-                    return r.width > 0 && r.height > 0;
-                  };
-                  const samples = nodes.slice(0, 3).map((el) => ({
-                    tag: (el.tagName || "").toLowerCase(),
-                    id: el.id || "",
-                    className: String(el.className || "").slice(0, 80),
-                    text: String(el.textContent || "").trim().slice(0, 120),
-                    visible: isVisible(el),
-                    rect: (() => {
-                      const r = el.getBoundingClientRect();
-                      return { w: Math.round(r.width), h: Math.round(r.height) };
-                    })()
-                  }));
-                  return {
-                    total: nodes.length,
-                    visible: samples.filter((s) => s.visible).length,
-                    samples,
-                  };
-                }
-                """,
-                selector,
-            )
-        except Exception as exc:
-            details = {"error": str(exc)}
-        out[selector] = details
-    return out
+            total += int(result.pop("count", 0) or 0)
+        except (TypeError, ValueError):
+            pass
+        details[selector] = result
+    return total, details
+
+
+def collect_selector_details(page, selectors: list[str]) -> dict[str, dict]:
+    return probe_captcha_selectors(page, selectors)[1]
 
 
 def count_visible_captcha_challenge(page, selectors: list[str]) -> int:
     """只统计可见验证码挑战节点，排除 recaptcha 法律声明文本。"""
-    total = 0
-    for selector in selectors:
-        try:
-            count = page.evaluate(
-                """
-                (sel) => {
-                  const nodes = Array.from(document.querySelectorAll(sel));
-                  const isVisible = (el) => {
-                    const st = window.getComputedStyle(el);
-                    if (!st) return false;
-                    if (st.display === "none" || st.visibility === "hidden") return false;
-                    const r = el.getBoundingClientRect();
-                    return r.width > 0 && r.height > 0;
-                  };
-                  const isLegalNotice = (el) => {
-                    const cls = String(el.className || "").toLowerCase();
-                    const text = String(el.textContent || "").toLowerCase();
-                    return (
-                      cls.includes("recaptchalegal") ||
-                      (text.includes("protected by recaptcha") &&
-                       text.includes("privacy policy") &&
-                       text.includes("terms of service"))
-                    );
-                  };
-                  return nodes.filter((el) => isVisible(el) && !isLegalNotice(el)).length;
-                }
-                """,
-                selector,
-            )
-            total += int(count or 0)
-        except Exception:
+    return probe_captcha_selectors(page, selectors)[0]
+
+
+def _clickable_intent_flags(
+    snapshot_map: dict[str, SnapshotItem],
+    snapshot_intents: dict[str, set[str]],
+) -> tuple[bool, bool]:
+    """单次遍历得到 (存在登录按钮, 存在申请入口)，两者都命中即提前结束。"""
+    has_login = has_apply = False
+    for ref, intents in snapshot_intents.items():
+        if not intents:
             continue
-    return total
+        item = snapshot_map.get(ref)
+        if item is None or item.role not in _BUTTON_LIKE_ROLES:
+            continue
+        has_login = has_login or "login_action" in intents
+        has_apply = has_apply or "apply_entry" in intents
+        if has_login and has_apply:
+            break
+    return has_login, has_apply
 
 
 def collect_manual_required_evidence(
     *,
     page,
-    visible_text: str,
+    visible_text: str | PageTextView,
     snapshot_map: dict[str, SnapshotItem],
     snapshot_intents: dict[str, set[str]],
     page_text_intents: set[str],
@@ -114,29 +195,15 @@ def collect_manual_required_evidence(
         "[data-sitekey][data-callback]",
         "iframe[title*='captcha' i]",
     ]
-    captcha_element_count = count_visible_captcha_challenge(page, captcha_selectors)
-    lower_text = (visible_text or "").lower()
-    captcha_challenge_phrases = [
-        "i am not a robot",
-        "verify you are human",
-        "security check",
-        "complete the challenge",
-        "select all images",
-        "are you human",
-    ]
-    has_captcha_challenge_text = any(p in lower_text for p in captcha_challenge_phrases)
-
-    has_login_button = any(
-        ref in snapshot_map
-        and snapshot_map[ref].role in ("button", "link")
-        and "login_action" in intents
-        for ref, intents in snapshot_intents.items()
+    captcha_element_count, captcha_selector_details = probe_captcha_selectors(
+        page, captcha_selectors
     )
-    has_apply_cta = any(
-        ref in snapshot_map
-        and snapshot_map[ref].role in ("button", "link")
-        and "apply_entry" in intents
-        for ref, intents in snapshot_intents.items()
+    has_captcha_challenge_text = (
+        _CAPTCHA_PHRASE_RE.search(as_page_text_view(visible_text).raw) is not None
+    )
+
+    has_login_button, has_apply_cta = _clickable_intent_flags(
+        snapshot_map, snapshot_intents
     )
     has_login_button = has_login_button or ("login_action" in page_text_intents)
 
@@ -148,7 +215,7 @@ def collect_manual_required_evidence(
         "has_apply_cta": has_apply_cta,
     }
     details = {
-        "captcha_selector_details": collect_selector_details(page, captcha_selectors),
+        "captcha_selector_details": captcha_selector_details,
         "page_text_intents": sorted(page_text_intents),
     }
     return evidence, details
@@ -200,39 +267,21 @@ def select_apply_entry_candidate(
     current_url: str,
 ) -> SnapshotItem | None:
     """在职位详情页中定位进入申请流程的 Apply 候选。"""
-    current_url = (current_url or "").lower()
-    if "/application" in current_url or "/apply" in current_url:
+    if _APPLICATION_URL_RE.search(current_url or "") is not None:
         return None
 
-    candidates: list[SnapshotItem] = []
+    # 只需最优一项：单次遍历维护 (非 button, 文案长度) 最小者，先到者优先
+    best: SnapshotItem | None = None
+    best_key: tuple[bool, int] | None = None
     for ref, item in snapshot_map.items():
-        if item.role not in ("button", "link"):
+        if item.role not in _BUTTON_LIKE_ROLES:
             continue
-        intents = snapshot_intents.get(ref, set())
-        if "apply_entry" not in intents:
+        if "apply_entry" not in snapshot_intents.get(ref, ()):
             continue
-        label = (item.name or "").lower()
-        if any(
-            bad in label
-            for bad in [
-                "replace",
-                "upload",
-                "autofill",
-                "tailor",
-                "settings",
-                "profile",
-                "close",
-            ]
-        ):
+        name = item.name or ""
+        if _BAD_APPLY_LABEL_RE.search(name) is not None:
             continue
-        candidates.append(item)
-    if not candidates:
-        return None
-
-    candidates.sort(
-        key=lambda it: (
-            it.role != "button",
-            len(it.name),
-        )
-    )
-    return candidates[0]
+        key = (item.role != "button", len(name))
+        if best_key is None or key < best_key:
+            best, best_key = item, key
+    return best
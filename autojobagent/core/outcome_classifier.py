@@ -9,9 +9,111 @@
 
 from __future__ import annotations
 
+import re
 from dataclasses import dataclass
 from typing import Literal
 
+from .keyword_match import phrase_pattern
+
+_SUCCESS_PHRASES = (
+    "thank you for applying",
+    "thanks for your application",
+    "application submitted",
+    "application received",
+    "successfully submitted",
+    "your application has been submitted",
+    "application complete",
+    "thanks for submitting",
+)
+_SUCCESS_RE = phrase_pattern(_SUCCESS_PHRASES)
+_SUCCESS_FOLLOWUP_PHRASES = (
+    "we'll be in touch",
+    "we will review your application",
+)
+# 完成度评估：成功文案与后续跟进文案合并为一次扫描
+_COMPLETION_SUCCESS_RE = phrase_pattern(_SUCCESS_PHRASES + _SUCCESS_FOLLOWUP_PHRASES)
+_COMPLETION_BLOCK_PHRASES = (
+    "flagged as possible spam",
+    "couldn't submit your application",
+    "suspicious activity",
+    "try again",
+    "rate limit",
+)
+_COMPLETION_BLOCK_RE = phrase_pattern(_COMPLETION_BLOCK_PHRASES)
+# 终态二次验证：页面仍有表单错误提示时不应判定为已提交
+_COMPLETION_FORM_ERROR_RE = phrase_pattern(
+    (
+        "this field is required",
+        "please fill",
+        "is required",
+        "missing required",
+        "please complete",
+        "invalid",
+    )
+)
+_URL_SUCCESS_RE = re.compile(
+    r"/(?:thanks|thank-you|success|submitted|complete|confirmation)",
+    re.IGNORECASE,
+)
+_EXTERNAL_BLOCK_PHRASES = (
+    "flagged as possible spam",
+    "suspicious activity",
+    "anti-spam",
+    "risk",
+    "rate limit",
+    "too many requests",
+    "try again later",
+)
+_TRANSIENT_PHRASES = (
+    "network error",
+    "temporarily unavailable",
+    "timeout",
+    "timed out",
+    "connection error",
+    "server error",
+    "5xx",
+)
+
+# 提交结果关键词：按优先级排列的 (分组名, classification, reason_code)
+_OUTCOME_KEYWORD_CLASSES = (
+    ("success", "success_confirmed", "completion_detected"),
+    ("external", "external_blocked", "anti_spam_or_risk_blocked"),
+    ("transient", "transient_network", "network_or_server_transient"),
+)
+# 三类关键词合并为一个前瞻交替式：一次扫描即可得到所有命中类别；
+# 零宽匹配逐位置尝试，同一位置按优先级先试高优先级分组
+_OUTCOME_KEYWORD_RE = re.compile(
+    "(?="
+    + "|".join(
+        f"(?P<{name}>{'|'.join(map(re.escape, phrases))})"
+        for name, phrases in (
+            ("success", _SUCCESS_PHRASES),
+            ("external", _EXTERNAL_BLOCK_PHRASES),
+            ("transient", _TRANSIENT_PHRASES),
+        )
+    )
+    + ")",
+    re.IGNORECASE,
+)
+_OUTCOME_KEYWORD_RANK = {
+    name: rank for rank, (name, _, _) in enumerate(_OUTCOME_KEYWORD_CLASSES)
+}
+
+
+def _keyword_outcome(text: str) -> tuple[str, str] | None:
+    """单次扫描返回优先级最高的关键词类别 (classification, reason_code)。"""
+    best: int | None = None
+    for match in _OUTCOME_KEYWORD_RE.finditer(text):
+        rank = _OUTCOME_KEYWORD_RANK[match.lastgroup]
+        if best is None or rank < best:
+            best = rank
+            if rank == 0:
+                break
+    if best is None:
+        return None
+    _, classification, reason_code = _OUTCOME_KEYWORD_CLASSES[best]
+    return classification, reason_code
+
 
 @dataclass
 class SubmissionOutcome:
@@ -34,18 +136,13 @@ class CompletionAssessment:
     signals: dict[str, bool | float]
 
 
-def looks_like_completion_text(lower_text: str) -> bool:
-    success_indicators = [
-        "thank you for applying",
-        "thanks for your application",
-        "application submitted",
-        "application received",
-        "successfully submitted",
-        "your application has been submitted",
-        "application complete",
-        "thanks for submitting",
-    ]
-    return any(token in lower_text for token in success_indicators)
+def looks_like_completion_text(text: str | None) -> bool:
+    # 模式忽略大小写，原文可直接传入，无需先 lower 拷贝
+    return _SUCCESS_RE.search(text or "") is not None
+
+
+def has_completion_form_error(text: str | None) -> bool:
+    return _COMPLETION_FORM_ERROR_RE.search(text or "") is not None
 
 
 def assess_completion_confidence(
@@ -55,38 +152,11 @@ def assess_completion_confidence(
     has_submit_button: bool,
     has_error: bool,
 ) -> CompletionAssessment:
-    lower = (body_text or "").lower()
-    url_lower = (current_url or "").lower()
-
-    success_text = looks_like_completion_text(lower) or any(
-        token in lower
-        for token in (
-            "we'll be in touch",
-            "we will review your application",
-            "application complete",
-        )
-    )
-    external_blocked = any(
-        token in lower
-        for token in (
-            "flagged as possible spam",
-            "couldn't submit your application",
-            "suspicious activity",
-            "try again",
-            "rate limit",
-        )
-    )
-    url_success_hint = any(
-        token in url_lower
-        for token in (
-            "/thanks",
-            "/thank-you",
-            "/success",
-            "/submitted",
-            "/complete",
-            "/confirmation",
-        )
-    )
+    body_text = body_text or ""
+
+    success_text = _COMPLETION_SUCCESS_RE.search(body_text) is not None
+    external_blocked = _COMPLETION_BLOCK_RE.search(body_text) is not None
+    url_success_hint = _URL_SUCCESS_RE.search(current_url or "") is not None
 
     score = 0.0
     if success_text:
@@ -129,46 +199,15 @@ def classify_submission_outcome(
     progression_block_reason: str | None,
     progression_block_snippets: list[str],
 ) -> SubmissionOutcome:
-    lower = (evidence_text or "").lower()
-    if looks_like_completion_text(lower):
-        return SubmissionOutcome(
-            classification="success_confirmed",
-            reason_code="completion_detected",
-            evidence_snippet=evidence_text[:220],
-        )
-    if any(
-        k in lower
-        for k in [
-            "flagged as possible spam",
-            "suspicious activity",
-            "anti-spam",
-            "risk",
-            "rate limit",
-            "too many requests",
-            "try again later",
-        ]
-    ):
-        return SubmissionOutcome(
-            classification="external_blocked",
-            reason_code="anti_spam_or_risk_blocked",
-            evidence_snippet=evidence_text[:220],
-        )
-    if any(
-        k in lower
-        for k in [
-            "network error",
-            "temporarily unavailable",
-            "timeout",
-            "timed out",
-            "connection error",
-            "server error",
-            "5xx",
-        ]
-    ):
+    evidence_text = evidence_text or ""
+    evidence_snippet = evidence_text[:220]
+    keyword_hit = _keyword_outcome(evidence_text)
+    if keyword_hit is not None:
+        classification, reason_code = keyword_hit
         return SubmissionOutcome(
-            classification="transient_network",
-            reason_code="network_or_server_transient",
-            evidence_snippet=evidence_text[:220],
+            classification=classification,
+            reason_code=reason_code,
+            evidence_snippet=evidence_snippet,
         )
     if progression_block_reason:
         snippets = " | ".join((progression_block_snippets or [])[:2])
@@ -178,16 +217,14 @@ def classify_submission_outcome(
             reason_code="missing_required_field",
             evidence_snippet=snippet[:220],
         )
-    if action_success:
-        return SubmissionOutcome(
-            classification="unknown_blocked",
-            reason_code="submit_clicked_without_confirmed_transition",
-            evidence_snippet=evidence_text[:220],
-        )
     return SubmissionOutcome(
         classification="unknown_blocked",
-        reason_code="submit_action_failed",
-        evidence_snippet=evidence_text[:220],
+        reason_code=(
+            "submit_clicked_without_confirmed_transition"
+            if action_success
+            else "submit_action_failed"
+        ),
+        evidence_snippet=evidence_snippet,
     )
 
 
@@ -0,0 +1,50 @@
+"""
+页面文本视图（V2 拆分）
+
+职责：
+- 同一页文本在一轮观察内只包装一次，供人工门控/意图推断等检测器复用
+- 缓存文本前缀摘要，label/text 意图缓存 key 不再重复编码与哈希
+- 兼容旧接口：检测器同时接受 str 与 PageTextView
+"""
+
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass, field
+from functools import cached_property
+
+
+@dataclass
+class PageTextView:
+    """一次观察得到的页面文本，派生视图按需惰性计算并缓存。"""
+
+    raw: str
+    _digests: dict[tuple[int, bool], bytes] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    @cached_property
+    def stripped(self) -> str:
+        return self.raw.strip()
+
+    def prefix(self, limit: int, *, strip: bool = False) -> str:
+        return (self.stripped if strip else self.raw)[:limit]
+
+    def prefix_digest(self, limit: int, *, strip: bool = False) -> bytes:
+        """前缀文本的 sha1 摘要，按 (limit, strip) 缓存。"""
+        key = (limit, strip)
+        digest = self._digests.get(key)
+        if digest is None:
+            digest = text_digest(self.prefix(limit, strip=strip))
+            self._digests[key] = digest
+        return digest
+
+
+def text_digest(text: str) -> bytes:
+    return hashlib.sha1(text.encode("utf-8")).digest()
+
+
+def as_page_text_view(text: str | PageTextView | None) -> PageTextView:
+    if isinstance(text, PageTextView):
+        return text
+    return PageTextView(text or "")
@@ -9,56 +9,59 @@
 from __future__ import annotations
 
 import json
+import re
+
+from .keyword_match import phrase_pattern
+
+# 代码块正文：从围栏所在行的下一行到下一个 ```
+_JSON_FENCE_RE = re.compile(r"```json[^\n]*\n(.*?)```", re.DOTALL)
+_ANY_FENCE_RE = re.compile(r"```[^\n]*\n(.*?)```", re.DOTALL)
+_SIMPLIFY_MENTION_RE = re.compile("simplify", re.IGNORECASE)
+_SIMPLIFY_CLAIM_RE = phrase_pattern(
+    (
+        "已自动填写",
+        "自动填写完成",
+        "simplify 已",
+        "simplify已",
+        "autofill complete",
+        "autofilled",
+    )
+)
+
+
+def _loads_or_none(text: str):
+    try:
+        return json.loads(text)
+    except ValueError:
+        return None
 
 
 def safe_parse_json(raw: str) -> dict | None:
     """安全解析 JSON，支持 markdown 代码块包装。"""
-    try:
-        return json.loads(raw)
-    except Exception:
-        pass
+    data = _loads_or_none(raw)
+    if data is not None:
+        return data
 
     if "```" in raw:
-        try:
-            start = raw.find("```json")
-            if start != -1:
-                start = raw.find("\n", start) + 1
-                end = raw.find("```", start)
-                if end != -1:
-                    return json.loads(raw[start:end].strip())
-            start = raw.find("```")
-            if start != -1:
-                start = raw.find("\n", start) + 1
-                end = raw.find("```", start)
-                if end != -1:
-                    return json.loads(raw[start:end].strip())
-        except Exception:
-            pass
+        # 优先 ```json 代码块，其次任意代码块
+        for fence_re in (_JSON_FENCE_RE, _ANY_FENCE_RE):
+            match = fence_re.search(raw)
+            if match is not None:
+                data = _loads_or_none(match.group(1).strip())
+                if data is not None:
+                    return data
 
-    try:
-        start = raw.find("{")
-        end = raw.rfind("}")
-        if start != -1 and end != -1 and end > start:
-            return json.loads(raw[start : end + 1])
-    except Exception:
-        pass
+    start = raw.find("{")
+    end = raw.rfind("}")
+    if start != -1 and end > start:
+        return _loads_or_none(raw[start : end + 1])
     return None
 
 
 def sanitize_simplify_claims(text: str | None) -> str | None:
-    if not text:
+    # 绝大多数字段不提 Simplify：先用忽略大小写的单次扫描短路，不生成 lower 副本
+    if not text or _SIMPLIFY_MENTION_RE.search(text) is None:
         return text
-    lowered = text.lower()
-    if "simplify" not in lowered:
-        return text
-    claim_markers = [
-        "已自动填写",
-        "自动填写完成",
-        "simplify 已",
-        "simplify已",
-        "autofill complete",
-        "autofilled",
-    ]
-    if any(marker in lowered for marker in claim_markers):
+    if _SIMPLIFY_CLAIM_RE.search(text) is not None:
         return text.replace("Simplify", "页面").replace("simplify", "页面")
     return text
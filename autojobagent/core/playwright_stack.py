@@ -0,0 +1,62 @@
+"""
+Playwright 调用栈采集优化（V2 拆分）
+
+职责：
+- 同步 API 每次调用都会执行 inspect.stack() / traceback.extract_stack()，
+  前者会为每一帧读取源码上下文，是高频调用（evaluate/click/fill）的主要固定开销
+- 替换为只遍历帧对象、不读源码的等价采集：apiName、报错前缀与调用位置保持不变，
+  源码行在真正格式化异常时才按需读取
+- 通过环境变量 PW_INSPECT_STACK=1 保留 Playwright 原始行为
+"""
+
+from __future__ import annotations
+
+import inspect
+import os
+import sys
+import traceback
+from types import SimpleNamespace
+
+_INSTALLED = False
+
+
+def _light_stack() -> list[inspect.FrameInfo]:
+    """与 inspect.stack() 同序（调用方在前）的帧列表，但不读取源码上下文。"""
+    frames: list[inspect.FrameInfo] = []
+    frame = sys._getframe(1)
+    while frame is not None:
+        code = frame.f_code
+        frames.append(
+            inspect.FrameInfo(
+                frame, code.co_filename, frame.f_lineno, code.co_name, None, None
+            )
+        )
+        frame = frame.f_back
+    return frames
+
+
+def _light_extract_stack() -> traceback.StackSummary:
+    """与 traceback.extract_stack() 同序（最外层在前），源码行延迟到格式化时读取。"""
+    stack = traceback.StackSummary.extract(
+        traceback.walk_stack(sys._getframe(1)), lookup_lines=False
+    )
+    stack.reverse()
+    return stack
+
+
+def install_fast_stack_capture() -> bool:
+    """为 Playwright 同步 API 换上轻量栈采集；重复调用无副作用，返回是否已生效。"""
+    global _INSTALLED
+    if _INSTALLED:
+        return True
+    if os.getenv("PW_INSPECT_STACK", "0").strip() == "1":
+        return False
+    try:
+        from playwright._impl import _sync_base
+    except Exception:
+        return False
+    # _sync_base 只在 SyncBase._sync 中使用这两个模块，替换模块级引用即可
+    _sync_base.inspect = SimpleNamespace(stack=_light_stack)
+    _sync_base.traceback = SimpleNamespace(extract_stack=_light_extract_stack)
+    _INSTALLED = True
+    return True
@@ -8,9 +8,10 @@ Prompt 构建模块（V2 拆分第四步）
 
 from __future__ import annotations
 
+from functools import lru_cache
 
-def build_system_prompt(*, user_info: str, agent_guidelines: str) -> str:
-    return f"""你是一个浏览器自动化 AI Agent，正在帮用户填写英文求职申请表单。
+# system prompt 模板（import 时构建一次）；字面量花括号以 {{ }} 转义
+_SYSTEM_PROMPT_TMPL = """你是一个浏览器自动化 AI Agent，正在帮用户填写英文求职申请表单。
 
 ## ⚖️ 合规声明
 
@@ -183,6 +184,18 @@ type(Location, Dallas) → 下拉框出现 → click(Dallas, Texas, United State
 **核心原则：能操作就操作，不要轻易放弃！**"""
 
 
+def build_system_prompt(*, user_info: str, agent_guidelines: str) -> str:
+    # 同一任务内 user_info / agent_guidelines 不变，每轮复用同一份 prompt 字符串
+    return _build_system_prompt_cached(user_info, agent_guidelines)
+
+
+@lru_cache(maxsize=8)
+def _build_system_prompt_cached(user_info: str, agent_guidelines: str) -> str:
+    return _SYSTEM_PROMPT_TMPL.format_map(
+        {"user_info": user_info, "agent_guidelines": agent_guidelines}
+    )
+
+
 def build_user_prompt(
     *,
     history_text: str,
@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import json
 import os
 import re
 from dataclasses import dataclass
@@ -10,8 +9,13 @@ from typing import Callable, Optional
 from openai import OpenAI
 from playwright.sync_api import Page
 
+from .planner import safe_parse_json
+
 LogFn = Callable[[str, str], None]
 
+_WS_RE = re.compile(r"\s+")
+_FILENAME_TOKEN_SPLIT_RE = re.compile(r"[_\-\s\.]+")
+
 
 @dataclass
 class ResumeMatchResult:
@@ -33,8 +37,22 @@ def extract_jd_text_from_page(page: Page, max_chars: int = 12000) -> str:
         return ""
 
     # 轻量清洗：压缩空白，避免给模型过多噪声
-    cleaned = re.sub(r"\s+", " ", text or "").strip()
-    return cleaned[:max_chars]
+    return _collapse_whitespace_prefix(text or "", max_chars)
+
+
+def _collapse_whitespace_prefix(text: str, max_chars: int) -> str:
+    """
+    等价于 _WS_RE.sub(" ", text).strip()[:max_chars]，但只清洗够用的前缀：
+    先取 4 倍窗口，清洗后仍不足 max_chars（空白极多）时再扩大窗口。
+    """
+    window = max(max_chars, 1) * 4
+    while window < len(text):
+        cleaned = _WS_RE.sub(" ", text[:window]).lstrip()
+        # 严格大于：末尾可能是被截断的空白，前 max_chars 个字符已与全量清洗一致
+        if len(cleaned) > max_chars:
+            return cleaned[:max_chars]
+        window *= 4
+    return _WS_RE.sub(" ", text).strip()[:max_chars]
 
 
 def choose_best_resume_for_jd(
@@ -126,7 +144,7 @@ Return JSON only:
             ],
         )
         raw = completion.choices[0].message.content or ""
-        data = _safe_parse_json(raw)
+        data = safe_parse_json(raw)
         if not data:
             log("resume matching: llm json parse failed, fallback to heuristic", "warn")
             return None
@@ -166,10 +184,19 @@ def _heuristic_score_resume_candidates(
     best_path = candidates[0]
     best_raw_score = -1
 
+    # 同一 token（resume/cv/pdf/姓名等）常在多个候选文件名中重复出现，
+    # 每个 token 只对 JD 做一次子串查找
+    token_hits: dict[str, bool] = {}
     for path in candidates:
         name = Path(path).name.lower()
-        tokens = [t for t in re.split(r"[_\-\s\.]+", name) if len(t) > 1]
-        overlap = sum(1 for t in tokens if t in jd_lower)
+        overlap = 0
+        for t in _FILENAME_TOKEN_SPLIT_RE.split(name):
+            if len(t) <= 1:
+                continue
+            hit = token_hits.get(t)
+            if hit is None:
+                hit = token_hits[t] = t in jd_lower
+            overlap += hit
         if overlap > best_raw_score:
             best_raw_score = overlap
             best_path = path
@@ -183,33 +210,3 @@ def _heuristic_score_resume_candidates(
         candidates_count=len(candidates),
         jd_chars=len(jd_text or ""),
     )
-
-
-def _safe_parse_json(raw: str) -> dict | None:
-    try:
-        return json.loads(raw)
-    except Exception:
-        pass
-
-    if "```" in raw:
-        try:
-            start = raw.find("```json")
-            if start != -1:
-                start = raw.find("\n", start) + 1
-            else:
-                start = raw.find("```") + 3
-                start = raw.find("\n", start) + 1
-            end = raw.find("```", start)
-            if end != -1:
-                return json.loads(raw[start:end].strip())
-        except Exception:
-            pass
-
-    if "{" in raw and "}" in raw:
-        try:
-            start = raw.index("{")
-            end = raw.rfind("}") + 1
-            return json.loads(raw[start:end])
-        except Exception:
-            pass
-    return None
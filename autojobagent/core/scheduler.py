@@ -15,6 +15,8 @@ from dataclasses import dataclass
 from threading import Event, Thread
 from typing import Optional
 
+from sqlalchemy import select, update
+
 from ..db.database import get_session
 from ..models.job_post import JobPost, JobStatus
 from .applier import apply_for_job
@@ -39,6 +41,8 @@ class JobScheduler:
     def __init__(self, config: Optional[SchedulerConfig] = None) -> None:
         self.config = config or SchedulerConfig()
         self._stop_event = Event()
+        # 新任务入队/停止时唤醒主循环；poll_interval 仅作为兜底轮询间隔
+        self._wake = Event()
         self._thread: Optional[Thread] = None
         self._running = False
 
@@ -56,31 +60,65 @@ class JobScheduler:
 
     def stop(self) -> None:
         self._stop_event.set()
+        self._wake.set()
         self._running = False
 
-    def _run_loop(self) -> None:
-        import time
+    def notify(self) -> None:
+        """有新 pending 任务时调用，空闲中的主循环立即取任务。"""
+        self._wake.set()
 
+    def _run_loop(self) -> None:
         while not self._stop_event.is_set():
+            # 先清除再取任务：取任务之后到来的 notify 不会丢失
+            self._wake.clear()
             job = self._fetch_next_pending_job()
             if not job:
-                time.sleep(self.config.poll_interval_seconds)
+                self._wake.wait(timeout=self.config.poll_interval_seconds)
                 continue
 
             self._process_job(job)
 
     def _fetch_next_pending_job(self) -> Optional[JobPost]:
+        """
+        原子认领最早的 pending 任务：单条 UPDATE ... RETURNING 完成选取与置位，
+        多实例并发轮询时同一任务不会被重复认领。
+        """
         with get_session() as session:
-            job = (
-                session.query(JobPost)
-                .filter(JobPost.status == JobStatus.PENDING)
+            if not session.get_bind().dialect.update_returning:
+                return self._fetch_next_pending_job_two_step(session)
+            oldest_pending = (
+                select(JobPost.id)
+                .where(JobPost.status == JobStatus.PENDING)
                 .order_by(JobPost.create_time.asc())
-                .first()
+                .limit(1)
+                .with_for_update(skip_locked=True)
+                .scalar_subquery()
+            )
+            stmt = (
+                update(JobPost)
+                .where(
+                    JobPost.id == oldest_pending,
+                    JobPost.status == JobStatus.PENDING,
+                )
+                .values(status=JobStatus.IN_PROGRESS)
+                .returning(JobPost)
+                .execution_options(synchronize_session=False)
             )
-            if job:
-                job.status = JobStatus.IN_PROGRESS
-                session.add(job)
-            return job
+            return session.execute(stmt).scalar_one_or_none()
+
+    @staticmethod
+    def _fetch_next_pending_job_two_step(session) -> JobPost | None:
+        # 不支持 UPDATE ... RETURNING 的数据库：沿用先查后改
+        job = (
+            session.query(JobPost)
+            .filter(JobPost.status == JobStatus.PENDING)
+            .order_by(JobPost.create_time.asc())
+            .first()
+        )
+        if job:
+            job.status = JobStatus.IN_PROGRESS
+            session.add(job)
+        return job
 
     def _process_job(self, job: JobPost) -> None:
         """
@@ -10,15 +10,21 @@
 from __future__ import annotations
 
 import hashlib
-import json
+import re
 from dataclasses import dataclass
 from typing import Optional
 from urllib.parse import urlsplit
 
 from .ui_snapshot import SnapshotItem
 
+# 错误提示关键词；多词短语允许任意空白，与按行折叠空白后的匹配结果一致
+_ERROR_KEYWORD_RE = re.compile(
+    r"required|missing|invalid|error|please\s+complete|please\s+fill|failed",
+    re.IGNORECASE,
+)
 
-@dataclass
+
+@dataclass(slots=True)
 class SemanticElement:
     ref_id: str
     role: str
@@ -49,100 +55,123 @@ def extract_semantic_error_snippets(
     visible_text: str, last_progression_block_snippets: list[str] | None = None
 ) -> list[str]:
     snippets: list[str] = []
-    keywords = (
-        "required",
-        "missing",
-        "invalid",
-        "error",
-        "please complete",
-        "please fill",
-        "failed",
-    )
-    for raw in (visible_text or "").splitlines():
-        line = " ".join(raw.split()).strip()
-        if len(line) < 8 or len(line) > 200:
-            continue
-        lower = line.lower()
-        if any(k in lower for k in keywords):
+    text = visible_text or ""
+    # 整段文本先做一次 C 层扫描：无错误关键词（常见情况）时直接跳过逐行处理
+    if _ERROR_KEYWORD_RE.search(text) is not None:
+        for raw in text.splitlines():
+            if _ERROR_KEYWORD_RE.search(raw) is None:
+                continue
+            line = " ".join(raw.split())
+            if len(line) < 8 or len(line) > 200:
+                continue
             snippets.append(line[:180])
-        if len(snippets) >= 6:
-            break
+            if len(snippets) >= 6:
+                break
     if not snippets and last_progression_block_snippets:
         snippets = [str(s)[:180] for s in last_progression_block_snippets[:3]]
     return snippets
 
 
-def build_semantic_snapshot(
-    current_url: str,
-    snapshot_map: dict[str, SnapshotItem],
-    *,
-    page_title: str = "",
-    visible_text: str = "",
-    last_progression_block_snippets: list[str] | None = None,
-) -> SemanticSnapshot:
-    parsed = urlsplit(current_url or "")
-    domain = (parsed.netloc or "unknown").lower()
-    path = (parsed.path or "/").lower()
-    stable_parts = [p for p in path.split("/") if p and p not in {"jobs", "job"}]
-    normalized_path = "/" + "/".join(stable_parts[:3]) if stable_parts else "/"
+_FILLABLE_ROLES = frozenset(("textbox", "combobox", "file_input"))
+_SUBMIT_ROLES = frozenset(("button", "link"))
+_SUBMIT_KEYWORD_RE = re.compile(r"submit|apply|continue|review|next", re.IGNORECASE)
+_MAX_REQUIRED_UNFILLED = 12
+_MAX_SUBMIT_CANDIDATES = 8
+
+
+@dataclass
+class _ElementView:
+    elements: list[SemanticElement]
+    required_unfilled: list[str]
+    submit_candidates: list[str]
+
 
+def _build_element_view(snapshot_map: dict[str, SnapshotItem]) -> _ElementView:
     elements: list[SemanticElement] = []
     required_unfilled: list[str] = []
     submit_candidates: list[str] = []
     sorted_items = sorted(snapshot_map.values(), key=lambda x: x.ref)[:160]
     for item in sorted_items:
+        # 每个元素只取一次 name/role，切片结果复用
+        role = item.role
+        name = item.name or ""
+        short_name = name[:120]
         value = (item.value_hint or "").strip()
         elem = SemanticElement(
             ref_id=item.ref,
-            role=item.role,
-            name=(item.name or "")[:120],
-            label=(item.name or "")[:120],
+            role=role,
+            name=short_name,
+            label=short_name,
             value=value or None,
             required=bool(item.required),
             disabled=False,
             checked=item.checked,
             visible=True,
-            group_signature=f"{item.role}:{(item.name or '')[:40].lower()}",
+            group_signature=f"{role}:{name[:40].lower()}",
         )
         elements.append(elem)
-        if (
-            item.required
-            and item.role in ("textbox", "combobox", "file_input")
-            and not value
-        ):
-            required_unfilled.append(f"{item.role}:{(item.name or '')[:80]}")
-        if item.role in ("button", "link"):
-            label_lower = (item.name or "").lower()
-            if any(
-                kw in label_lower
-                for kw in ("submit", "apply", "continue", "review", "next")
+        # 两类角色互斥，命中其一即不再判断另一类；各列表达到上限后不再格式化
+        if role in _FILLABLE_ROLES:
+            if (
+                item.required
+                and not value
+                and len(required_unfilled) < _MAX_REQUIRED_UNFILLED
             ):
-                submit_candidates.append(f"{item.ref}:{(item.name or '')[:80]}")
+                required_unfilled.append(f"{role}:{name[:80]}")
+        elif (
+            role in _SUBMIT_ROLES
+            and len(submit_candidates) < _MAX_SUBMIT_CANDIDATES
+            and _SUBMIT_KEYWORD_RE.search(name)
+        ):
+            submit_candidates.append(f"{item.ref}:{name[:80]}")
+    return _ElementView(
+        elements=elements,
+        required_unfilled=required_unfilled,
+        submit_candidates=submit_candidates,
+    )
+
+
+def _page_id(url_key: str, elements: list[SemanticElement]) -> str:
+    # 字段逐个喂入 hasher（\x1f 分隔字段、\x1e 分隔元素），不构建中间 dict/JSON
+    hasher = hashlib.blake2b(url_key.encode("utf-8"), digest_size=20)
+    hasher.update(b"\x1e")
+    for e in elements[:24]:
+        hasher.update(e.ref_id.encode("utf-8"))
+        hasher.update(b"\x1f")
+        hasher.update(e.role.encode("utf-8"))
+        hasher.update(b"\x1f")
+        hasher.update(e.name[:48].encode("utf-8"))
+        hasher.update(b"\x1e")
+    return hasher.hexdigest()
 
+
+def build_semantic_snapshot(
+    current_url: str,
+    snapshot_map: dict[str, SnapshotItem],
+    *,
+    page_title: str = "",
+    visible_text: str = "",
+    last_progression_block_snippets: list[str] | None = None,
+) -> SemanticSnapshot:
+    parsed = urlsplit(current_url or "")
+    domain = (parsed.netloc or "unknown").lower()
+    path = (parsed.path or "/").lower()
+    stable_parts = [p for p in path.split("/") if p and p not in {"jobs", "job"}]
+    normalized_path = "/" + "/".join(stable_parts[:3]) if stable_parts else "/"
+
+    view = _build_element_view(snapshot_map)
     errors = extract_semantic_error_snippets(
         visible_text,
         last_progression_block_snippets,
     )
-    page_id_seed = json.dumps(
-        {
-            "url": (current_url or "").split("#")[0],
-            "elements": [
-                {"ref": e.ref_id, "role": e.role, "name": e.name[:48]}
-                for e in elements[:24]
-            ],
-        },
-        ensure_ascii=False,
-        sort_keys=True,
-    )
-    page_id = hashlib.sha1(page_id_seed.encode("utf-8")).hexdigest()
     return SemanticSnapshot(
-        page_id=page_id,
+        page_id=_page_id((current_url or "").split("#")[0], view.elements),
         url=current_url or "",
         domain=domain,
         normalized_path=normalized_path,
         title=page_title or "",
-        elements=elements,
+        elements=view.elements,
         errors=errors,
-        required_unfilled=required_unfilled[:12],
-        submit_candidates=submit_candidates[:8],
+        required_unfilled=view.required_unfilled,
+        submit_candidates=view.submit_candidates,
     )
@@ -8,13 +8,16 @@
 
 from __future__ import annotations
 
+import re
 from dataclasses import dataclass
+from functools import lru_cache
 from urllib.parse import urlsplit
 
+from .dom_extract import QUESTION_BLOCKS_JS, take_question_blocks
 from .ui_snapshot import SnapshotItem
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class OptionNode:
     text: str
     role: str
@@ -23,7 +26,7 @@ class OptionNode:
     ref_id: str | None = None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class QuestionBlock:
     question_id: str
     question_text: str
@@ -34,7 +37,7 @@ class QuestionBlock:
     selected_options: list[str]
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class FieldNode:
     ref_id: str
     label: str
@@ -44,7 +47,7 @@ class FieldNode:
     has_error: bool
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class FormGraph:
     page_scope: str
     fields: list[FieldNode]
@@ -54,159 +57,81 @@ class FormGraph:
     error_snippets: list[str]
 
 
+_FIELD_ROLES = frozenset(("textbox", "combobox", "file_input"))
+_SUBMIT_ROLES = frozenset(("button", "link"))
+# 子串语义与原先逐词 `in` 判断一致（不加词边界），忽略大小写免去 lower 拷贝
+_SUBMIT_LABEL_RE = re.compile(r"submit|apply|continue|next", re.IGNORECASE)
+
+
 def _normalize_text(value: str | None) -> str:
-    return " ".join((value or "").split()).strip()
+    return _collapse_whitespace(value) if value else ""
 
 
-def _snapshot_ref_lookup(
-    snapshot_map: dict[str, SnapshotItem],
-) -> dict[tuple[str, str], list[str]]:
-    out: dict[tuple[str, str], list[str]] = {}
+@lru_cache(maxsize=4096)
+def _collapse_whitespace(value: str) -> str:
+    # 选项/字段文案高度重复（Yes/No/First name），按原文缓存；
+    # split/join 对短文案比正则 sub 更快，且结果无首尾空白，无需再 strip
+    return " ".join(value.split())
+
+
+def _payload_text(value) -> str:
+    # 页面脚本的 clean() 已按 str.split() 的空白规则归一化字符串，直接信任；
+    # 仅非字符串值（异常载荷）才走一次归一化
+    if isinstance(value, str):
+        return value
+    return _normalize_text(str(value)) if value else ""
+
+
+RefLookup = dict[tuple[str, str], tuple[str, ...]]
+
+
+def snapshot_ref_lookup(snapshot_map: dict[str, SnapshotItem]) -> RefLookup:
+    """(role, 归一化 name) -> refs 只读索引；同一快照多次构建问题块时可显式复用。"""
+    grouped: dict[tuple[str, str], list[str]] = {}
     for ref, item in snapshot_map.items():
         key = (item.role.strip().lower(), _normalize_text(item.name).lower())
-        out.setdefault(key, []).append(ref)
-    return out
+        grouped.setdefault(key, []).append(ref)
+    return {key: tuple(refs) for key, refs in grouped.items()}
 
 
 def _try_consume_ref(
-    ref_lookup: dict[tuple[str, str], list[str]],
-    *,
-    role: str,
-    text: str,
+    ref_lookup: RefLookup,
+    consumed: dict[tuple[str, str], int],
+    key: tuple[str, str],
 ) -> str | None:
-    key = (role.strip().lower(), _normalize_text(text).lower())
-    refs = ref_lookup.get(key) or []
+    # key 由调用方用已归一化的 (role, text.lower()) 构造，这里不再重复归一化；
+    # 共享索引只读，本次调用已分配的数量记在 consumed 中
+    refs = ref_lookup.get(key)
     if not refs:
         return None
-    return refs.pop(0)
+    idx = consumed.get(key, 0)
+    if idx >= len(refs):
+        return None
+    consumed[key] = idx + 1
+    return refs[idx]
 
 
 def build_question_blocks(
-    page, snapshot_map: dict[str, SnapshotItem]
+    page,
+    snapshot_map: dict[str, SnapshotItem],
+    *,
+    ref_lookup: RefLookup | None = None,
 ) -> list[QuestionBlock]:
     """
     从页面中提取问题块（单选/多选/按钮组选项）。
+    优先复用 build_ui_snapshot 同次 evaluate 取回的问题块；
     失败时返回空列表，保证不影响主流程。
+    ref_lookup 为同一快照预先建好的索引，缺省时按 snapshot_map 现建。
     """
-    ref_lookup = _snapshot_ref_lookup(snapshot_map)
-    try:
-        raw_blocks = page.evaluate(
-            """
-            () => {
-              const clean = (v) => String(v || "").replace(/\\s+/g, " ").trim();
-              const isVisible = (el) => {
-                if (!el) return false;
-                const st = window.getComputedStyle(el);
-                if (!st) return false;
-                if (st.display === "none" || st.visibility === "hidden") return false;
-                const r = el.getBoundingClientRect();
-                return r.width > 0 && r.height > 0;
-              };
-              const controlCandidates = Array.from(document.querySelectorAll(
-                "input[type='radio'], input[type='checkbox'], [role='radio'], [role='checkbox'], button[aria-pressed], [aria-pressed='true'], [aria-pressed='false']"
-              )).filter(isVisible);
-
-              const containerOf = (el) => {
-                return (
-                  el.closest("fieldset") ||
-                  el.closest("[role='radiogroup']") ||
-                  el.closest("[role='group']") ||
-                  el.closest("[aria-labelledby]") ||
-                  el.parentElement
-                );
-              };
-
-              const questionTextOf = (container) => {
-                if (!container) return "";
-                const legend = clean(container.querySelector("legend")?.innerText);
-                if (legend) return legend;
-                const ariaLabel = clean(container.getAttribute("aria-label"));
-                if (ariaLabel) return ariaLabel;
-                const labelledBy = container.getAttribute("aria-labelledby");
-                if (labelledBy) {
-                  const parts = labelledBy.split(/\\s+/).map((id) => clean(document.getElementById(id)?.innerText)).filter(Boolean);
-                  if (parts.length) return clean(parts.join(" "));
-                }
-                const labelLike = clean(
-                  container.querySelector("label, h1, h2, h3, h4, p, span")?.innerText
-                );
-                return labelLike;
-              };
-
-              const optionTextOf = (el) => {
-                const labelFromFor = (() => {
-                  const id = el.getAttribute("id");
-                  if (!id) return "";
-                  return clean(document.querySelector(`label[for="${id}"]`)?.innerText);
-                })();
-                const own = clean(el.innerText);
-                const aria = clean(el.getAttribute("aria-label"));
-                const parent = clean(el.parentElement?.innerText);
-                return labelFromFor || own || aria || parent;
-              };
-
-              const selectedOf = (el) => {
-                if (el.matches("input[type='radio'], input[type='checkbox']")) {
-                  return !!el.checked;
-                }
-                const ariaChecked = el.getAttribute("aria-checked");
-                if (ariaChecked === "true") return true;
-                if (ariaChecked === "false") return false;
-                const ariaPressed = el.getAttribute("aria-pressed");
-                if (ariaPressed === "true") return true;
-                if (ariaPressed === "false") return false;
-                const cls = String(el.className || "").toLowerCase();
-                return cls.includes("selected") || cls.includes("active") || cls.includes("checked");
-              };
-
-              const roleOf = (el) => {
-                const tag = (el.tagName || "").toLowerCase();
-                const type = (el.getAttribute("type") || "").toLowerCase();
-                if (tag === "input" && type === "radio") return "radio";
-                if (tag === "input" && type === "checkbox") return "checkbox";
-                const role = (el.getAttribute("role") || "").toLowerCase();
-                if (role) return role;
-                return tag || "unknown";
-              };
-
-              const groups = new Map();
-              controlCandidates.forEach((el, idx) => {
-                const container = containerOf(el);
-                const key = container || el;
-                const qText = clean(questionTextOf(container));
-                const optText = clean(optionTextOf(el));
-                if (!qText || !optText) return;
-                const role = roleOf(el);
-                const selected = selectedOf(el);
-                const disabled = !!el.disabled || el.getAttribute("aria-disabled") === "true";
-                const required = !!el.required || el.getAttribute("aria-required") === "true" || /\\*\\s*$/.test(qText);
-                const invalid = !!el.ariaInvalid || el.getAttribute("aria-invalid") === "true";
-                const bucket = groups.get(key) || {
-                  question_id: `q${groups.size + 1}`,
-                  question_text: qText,
-                  control_type: role === "radio" ? "single_choice" : "choice_group",
-                  required,
-                  has_error: invalid,
-                  options: []
-                };
-                bucket.options.push({
-                  text: optText,
-                  role,
-                  selected,
-                  disabled
-                });
-                if (invalid) bucket.has_error = true;
-                groups.set(key, bucket);
-              });
-
-              return Array.from(groups.values())
-                .filter((g) => g.options && g.options.length >= 2)
-                .slice(0, 16);
-            }
-            """
-        )
-    except Exception:
-        return []
+    if ref_lookup is None:
+        ref_lookup = snapshot_ref_lookup(snapshot_map)
+    consumed: dict[tuple[str, str], int] = {}
+    raw_blocks = take_question_blocks(page, snapshot_map)
+    if raw_blocks is None:
+        try:
+            raw_blocks = page.evaluate(QUESTION_BLOCKS_JS)
+        except Exception:
+            return []
 
     if not isinstance(raw_blocks, list):
         return []
@@ -215,7 +140,7 @@ def build_question_blocks(
     for idx, raw in enumerate(raw_blocks[:16], start=1):
         if not isinstance(raw, dict):
             continue
-        question_text = _normalize_text(str(raw.get("question_text") or ""))
+        question_text = _payload_text(raw.get("question_text"))
         if not question_text:
             continue
         options_raw = raw.get("options")
@@ -226,13 +151,13 @@ def build_question_blocks(
         for opt in options_raw[:10]:
             if not isinstance(opt, dict):
                 continue
-            text = _normalize_text(str(opt.get("text") or ""))
+            text = _payload_text(opt.get("text"))
             role = _normalize_text(str(opt.get("role") or "button")).lower() or "button"
             if not text:
                 continue
             selected = bool(opt.get("selected", False))
             disabled = bool(opt.get("disabled", False))
-            ref_id = _try_consume_ref(ref_lookup, role=role, text=text)
+            ref_id = _try_consume_ref(ref_lookup, consumed, (role, text.lower()))
             option = OptionNode(
                 text=text,
                 role=role,
@@ -304,10 +229,10 @@ def build_form_graph(
     submit_refs: list[str] = []
     for ref, item in snapshot_map.items():
         role = (item.role or "").strip().lower()
-        name = _normalize_text(item.name)
-        value_hint = _normalize_text(item.value_hint)
-        if role in ("textbox", "combobox", "file_input"):
-            filled = bool(value_hint)
+        # 两类角色互斥；其他角色（checkbox/radio/option）不需要归一化文案
+        if role in _FIELD_ROLES:
+            name = _normalize_text(item.name)
+            filled = bool(_normalize_text(item.value_hint))
             has_error = bool(item.required and not filled)
             node = FieldNode(
                 ref_id=ref,
@@ -320,10 +245,8 @@ def build_form_graph(
             fields.append(node)
             if node.required and not node.filled:
                 required_unfilled.append(f"{node.label}<{node.role}>")
-        if role in ("button", "link"):
-            lowered = name.lower()
-            if any(k in lowered for k in ("submit", "apply", "continue", "next")):
-                submit_refs.append(ref)
+        elif role in _SUBMIT_ROLES and _SUBMIT_LABEL_RE.search(item.name or ""):
+            submit_refs.append(ref)
     return FormGraph(
         page_scope=_build_page_scope(current_url),
         fields=fields[:80],
@@ -5,6 +5,7 @@ from dataclasses import dataclass
 from typing import Optional
 
 from playwright.sync_api import Page
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
 
 
 @dataclass
@@ -23,6 +24,88 @@ class SimplifyResult:
     observations: list[str] | None = None
 
 
+# 页面内完成信号：完成横幅或按钮变为 again；用于 wait_for_function 在浏览器内轮询
+_COMPLETION_SIGNAL_JS = """
+(completeText) => {
+  const text = (document.body && document.body.innerText) || "";
+  return text.includes(completeText) || text.includes("Autofill this page again");
+}
+"""
+# 完成信号的页面内轮询间隔：默认按动画帧轮询会每秒约 60 次读取 innerText 并强制布局
+_COMPLETION_SIGNAL_POLL_MS = 100
+
+
+# 单次 evaluate 完成一个 frame 的全部检查：可见按钮文本、完成横幅/again 按钮是否可见、
+# body 文本兜底。与 get_by_text 一致按元素 textContent 匹配（文案可跨多个子元素），
+# 只沿文本包含目标的子树下钻到最深元素；未命中时再逐层进入 open shadow root
+_FRAME_PROBE_JS = """
+(completeText) => {
+  const norm = (v) => String(v || "").replace(/\\s+/g, " ").trim().toLowerCase();
+  const skipTags = new Set(["SCRIPT", "STYLE", "NOSCRIPT", "TEMPLATE"]);
+  const isVisible = (el) => {
+    const st = window.getComputedStyle(el);
+    if (!st || st.visibility !== "visible") return false;
+    const rect = el.getBoundingClientRect();
+    return rect.width > 0 && rect.height > 0;
+  };
+  const findVisible = (root, needle) => {
+    const stack = [root];
+    while (stack.length) {
+      const node = stack.pop();
+      let childMatched = false;
+      let skippedMatched = false;
+      const kids = node.children;
+      for (let i = kids.length - 1; i >= 0; i--) {
+        const kid = kids[i];
+        if (!norm(kid.textContent).includes(needle)) continue;
+        if (skipTags.has(kid.tagName)) {
+          skippedMatched = true;
+          continue;
+        }
+        stack.push(kid);
+        childMatched = true;
+      }
+      if (childMatched || skippedMatched || node === root) continue;
+      if (isVisible(node)) return node;
+    }
+    return null;
+  };
+  const shadowRootsOf = (root) => {
+    const found = [];
+    const walker = document.createTreeWalker(root, NodeFilter.SHOW_ELEMENT);
+    for (let el = walker.nextNode(); el; el = walker.nextNode()) {
+      if (el.shadowRoot) found.push(el.shadowRoot);
+    }
+    return found;
+  };
+  const completeNeedle = norm(completeText);
+  let buttonText = null;
+  let againVisible = false;
+  let completeVisible = !completeNeedle;
+  const roots = [document];
+  while (roots.length) {
+    const root = roots.shift();
+    if (buttonText === null) {
+      const el = findVisible(root, "autofill this page");
+      if (el) buttonText = String(el.innerText || "").trim();
+    }
+    if (!againVisible) againVisible = !!findVisible(root, "autofill this page again");
+    if (!completeVisible) completeVisible = !!findVisible(root, completeNeedle);
+    if (buttonText !== null && againVisible && completeVisible) break;
+    roots.push(...shadowRootsOf(root));
+  }
+  const body = (document.body && document.body.innerText) || "";
+  return {
+    buttonText,
+    againVisible,
+    completeVisible: completeVisible && !!completeNeedle,
+    bodyComplete: body.includes(completeText),
+    bodyAgain: body.includes("Autofill this page again")
+  };
+}
+"""
+
+
 @dataclass
 class SimplifyState:
     status: str  # ready | running | completed | unavailable
@@ -90,6 +173,38 @@ def probe_simplify_state(page: Page) -> SimplifyState:
     )
 
 
+def _wait_for_completion_signal(
+    page: Page, complete_text: str, timeout_ms: int, fallback_ms: int
+) -> bool:
+    """
+    在主 frame 内等待完成信号，命中立即返回 True；超时返回 False。
+    等待本身出错（如页面跳转中）时退化为固定休眠，避免空转。
+    """
+    if timeout_ms <= 0:
+        return False
+    try:
+        page.main_frame.wait_for_function(
+            _COMPLETION_SIGNAL_JS,
+            arg=complete_text,
+            polling=_COMPLETION_SIGNAL_POLL_MS,
+            timeout=timeout_ms,
+        )
+        return True
+    except PlaywrightTimeoutError:
+        return False
+    except Exception:
+        page.wait_for_timeout(min(timeout_ms, fallback_ms))
+        return False
+
+
+def _has_child_frames(page: Page) -> bool:
+    try:
+        main = page.main_frame
+        return any(f is not main for f in page.frames)
+    except Exception:
+        return True
+
+
 def run_simplify(page: Page, config: Optional[SimplifyConfig] = None) -> SimplifyResult:
     """
     轮询 Simplify 按钮，点击一次，等待完成信号。
@@ -107,12 +222,21 @@ def run_simplify(page: Page, config: Optional[SimplifyConfig] = None) -> Simplif
     clicked = False
     last_seen = ""
     observations: list[str] = []
-    clicked_handle = None
+    seen_observations: set[str] = set()
+
+    def _observe(entry: str) -> None:
+        # 轮询期间同一观测只记录首次出现（状态变化），避免每轮重复追加
+        if entry not in seen_observations:
+            seen_observations.add(entry)
+            observations.append(entry)
 
     def _frames(p: Page):
-        yield p.main_frame
+        # page.frames 已包含主 frame，去重后每个 frame 每轮只探测一次
+        main = p.main_frame
+        yield main
         for f in p.frames:
-            yield f
+            if f is not main:
+                yield f
 
     # 先探测当前状态，避免重复点击/重复等待
     state = probe_simplify_state(page)
@@ -129,137 +253,91 @@ def run_simplify(page: Page, config: Optional[SimplifyConfig] = None) -> Simplif
 
     while time.time() < deadline:
         for frame in _frames(page):
-            # 记录按钮文本
             try:
-                btn = frame.get_by_text("Autofill this page", exact=False).first
-                if btn and btn.is_visible():
-                    last_seen = btn.inner_text().strip()
-                    observations.append(f"see_btn:{last_seen}")
-                    if not clicked and state.status != "running":
-                        btn.click()
-                        clicked_handle = btn
-                        observations.append(f"clicked:{last_seen}")
-                        clicked = True
-                        page.wait_for_timeout(700)
-            except Exception as e:
-                observations.append(f"btn_check_error:{type(e).__name__}")
-
-            # 若已点击，尝试读取同一按钮的最新文本
-            if clicked_handle:
-                try:
-                    txt_after = clicked_handle.inner_text().strip()
-                    observations.append(f"clicked_btn_text:{txt_after}")
-                    if "again" in txt_after.lower():
-                        observations.append("clicked_btn_became_again")
-                        return SimplifyResult(
-                            found=True,
-                            autofilled=True,
-                            message="Clicked button text became again",
-                            observations=observations,
-                        )
-                except Exception as e:
-                    observations.append(f"clicked_btn_error:{type(e).__name__}")
-
-            # 完成判定
-            try:
-                banner = frame.get_by_text("Autofill complete!", exact=False).first
-                if banner and banner.is_visible():
-                    observations.append("complete_banner_visible")
-                    return SimplifyResult(
-                        found=True,
-                        autofilled=True,
-                        message="Autofill complete banner",
-                        observations=observations,
-                    )
+                probe = frame.evaluate(_FRAME_PROBE_JS, cfg.complete_text)
             except Exception as e:
-                observations.append(f"banner_check_error:{type(e).__name__}")
+                _observe(f"probe_error:{type(e).__name__}")
+                continue
+            if not isinstance(probe, dict):
+                continue
 
-            try:
-                again_btn = frame.get_by_text(
-                    "Autofill this page again", exact=False
-                ).first
-                if again_btn and again_btn.is_visible():
-                    observations.append("button_became_again")
-                    return SimplifyResult(
-                        found=True,
-                        autofilled=True,
-                        message="Button turned to again",
-                        observations=observations,
-                    )
-            except Exception as e:
-                observations.append(f"again_check_error:{type(e).__name__}")
-
-            # 文本兜底（防止 get_by_text 未匹配到但文本已出现）
-            try:
-                body_text = frame.inner_text("body")
-                if "Autofill complete!" in body_text:
-                    observations.append("complete_text_found")
-                    return SimplifyResult(
-                        found=True,
-                        autofilled=True,
-                        message="Autofill complete text fallback",
-                        observations=observations,
-                    )
-                if "Autofill this page again" in body_text:
-                    observations.append("again_text_found")
+            # 记录按钮文本；首次看到可见按钮时点击一次
+            btn_text = probe.get("buttonText")
+            if btn_text is not None:
+                last_seen = str(btn_text)
+                _observe(f"see_btn:{last_seen}")
+                if not clicked and state.status != "running":
+                    try:
+                        frame.get_by_text(
+                            "Autofill this page", exact=False
+                        ).first.click()
+                        _observe(f"clicked:{last_seen}")
+                        clicked = True
+                        page.wait_for_timeout(700)
+                    except Exception as e:
+                        _observe(f"click_error:{type(e).__name__}")
+                    continue
+                # 已点击后按钮文本变为 again
+                if clicked and "again" in last_seen.lower():
+                    _observe("clicked_btn_became_again")
                     return SimplifyResult(
                         found=True,
                         autofilled=True,
-                        message="Button text fallback",
+                        message="Clicked button text became again",
                         observations=observations,
                     )
-            except Exception as e:
-                observations.append(f"text_fallback_error:{type(e).__name__}")
 
-        # 若本轮没有任何观察，尝试全局兜底点击与文本检查（避免遗漏 frame）
-        try:
-            btn_global = page.locator("text=Autofill this page").first
-            if btn_global and btn_global.is_visible():
-                observations.append("global_see_btn:Autofill this page")
-                if not clicked:
-                    btn_global.click()
-                    clicked_handle = btn_global
-                    observations.append("global_clicked:Autofill this page")
-                    clicked = True
-                    page.wait_for_timeout(700)
-                try:
-                    txt_after = btn_global.inner_text().strip()
-                    observations.append(f"global_btn_text:{txt_after}")
-                    if "again" in txt_after.lower():
-                        observations.append("global_btn_became_again")
-                        return SimplifyResult(
-                            found=True,
-                            autofilled=True,
-                            message="Global button turned to again",
-                            observations=observations,
-                        )
-                except Exception as e:
-                    observations.append(f"global_btn_text_error:{type(e).__name__}")
-        except Exception as e:
-            observations.append(f"global_btn_error:{type(e).__name__}")
+            # 完成判定
+            if probe.get("completeVisible"):
+                _observe("complete_banner_visible")
+                return SimplifyResult(
+                    found=True,
+                    autofilled=True,
+                    message="Autofill complete banner",
+                    observations=observations,
+                )
+            if probe.get("againVisible"):
+                _observe("button_became_again")
+                return SimplifyResult(
+                    found=True,
+                    autofilled=True,
+                    message="Button turned to again",
+                    observations=observations,
+                )
 
-        try:
-            body_global = page.inner_text("body")
-            if "Autofill complete!" in body_global:
-                observations.append("global_complete_text_found")
+            # 文本兜底（防止可见文本节点未匹配到但 body 文本已出现）
+            if probe.get("bodyComplete"):
+                _observe("complete_text_found")
                 return SimplifyResult(
                     found=True,
                     autofilled=True,
-                    message="Global body complete text",
+                    message="Autofill complete text fallback",
                     observations=observations,
                 )
-            if "Autofill this page again" in body_global:
-                observations.append("global_again_text_found")
+            if probe.get("bodyAgain"):
+                _observe("again_text_found")
                 return SimplifyResult(
                     found=True,
                     autofilled=True,
-                    message="Global body again text",
+                    message="Button text fallback",
                     observations=observations,
                 )
-        except Exception as e:
-            observations.append(f"global_body_error:{type(e).__name__}")
 
-        page.wait_for_timeout(cfg.poll_interval_ms)
+        if clicked or state.status == "running":
+            # 已触发自动填表：在浏览器内等待完成信号，命中即进入下一轮确认。
+            # 仅主 frame 时整段等待到截止时间；
+            # 存在子 frame 时按轮询间隔等待后再逐 frame 检查
+            remaining_ms = int((deadline - time.time()) * 1000)
+            wait_ms = (
+                min(remaining_ms, cfg.poll_interval_ms)
+                if _has_child_frames(page)
+                else remaining_ms
+            )
+            _wait_for_completion_signal(
+                page, cfg.complete_text, wait_ms, cfg.poll_interval_ms
+            )
+        else:
+            page.wait_for_timeout(cfg.poll_interval_ms)
 
     # 兜底：即便超时，也根据观测到的 again/complete 决定 autofilled
     if (
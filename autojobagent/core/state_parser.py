@@ -48,8 +48,9 @@ def parse_agent_response_payload(
             action_plan = [sanitize_claims(x) or "" for x in action_plan]
 
     next_action = None
-    if status == "continue" and data.get("next_action"):
-        act = data["next_action"]
+    act = data.get("next_action") if status == "continue" else None
+    # 与 page_overview 等字段一致按类型校验：非对象的 next_action 视为缺失
+    if act and isinstance(act, dict):
         target_question = act.get("target_question")
         if target_question is not None and not isinstance(target_question, str):
             target_question = str(target_question)
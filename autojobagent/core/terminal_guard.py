@@ -7,12 +7,11 @@
 
 from __future__ import annotations
 
+from .keyword_match import phrase_pattern
 
-def raw_response_implies_completion(raw: str) -> bool:
-    text = (raw or "").strip().lower()
-    if not text:
-        return False
-    indicators = [
+# 忽略大小写的单次扫描，无需先 strip/lower 拷贝整段响应
+_COMPLETION_RE = phrase_pattern(
+    (
         "successfully submitted",
         "application was successfully submitted",
         "your application has been submitted",
@@ -20,5 +19,11 @@ def raw_response_implies_completion(raw: str) -> bool:
         "thank you for applying",
         "process is complete",
         "application complete",
-    ]
-    return any(token in text for token in indicators)
+    )
+)
+
+
+def raw_response_implies_completion(raw: str) -> bool:
+    if not raw:
+        return False
+    return _COMPLETION_RE.search(raw) is not None
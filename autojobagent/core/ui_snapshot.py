@@ -5,13 +5,16 @@ UI 快照：生成可交互元素列表，提供 ref 供 LLM 选择。
 from __future__ import annotations
 
 import os
+import sys
 from dataclasses import dataclass
 from typing import Dict, List, Tuple
 
 from playwright.sync_api import Page
 
+from .dom_extract import extract_page_dom, remember_question_blocks
 
-@dataclass
+
+@dataclass(slots=True)
 class SnapshotItem:
     ref: str
     role: str
@@ -36,6 +39,25 @@ ROLE_ORDER = [
     "option",
 ]
 
+# 排序键：必填在前，同组内按角色名字母序；预先折算为整数，避免每项构造元组
+_ROLE_SORT_RANK = {
+    role: rank for rank, role in enumerate(sorted([*ROLE_ORDER, "file_input"]))
+}
+_OPTIONAL_RANK_OFFSET = len(_ROLE_SORT_RANK)
+
+
+# ref 字符串（e1..e256）跨快照复用同一批驻留字符串，不再每次重新格式化
+_REF_POOL = tuple(sys.intern(f"e{i + 1}") for i in range(256))
+
+
+def _ref_for(idx: int) -> str:
+    return _REF_POOL[idx] if idx < len(_REF_POOL) else f"e{idx + 1}"
+
+
+def _sort_rank(item: SnapshotItem) -> int:
+    rank = _ROLE_SORT_RANK[item.role]
+    return rank if item.required else rank + _OPTIONAL_RANK_OFFSET
+
 
 def build_ui_snapshot(
     page: Page,
@@ -49,177 +71,69 @@ def build_ui_snapshot(
     ref_map: Dict[str, SnapshotItem] = {}
     name_counters: Dict[tuple[str, str], int] = {}
 
-    def _next_ref(idx: int) -> str:
-        return f"e{idx + 1}"
-
-    def _describe(el) -> dict:
-        try:
-            return el.evaluate(
-                """
-                (el) => {
-                  const label = el.labels && el.labels.length ? el.labels[0].innerText : "";
-                  const aria = el.getAttribute("aria-label") || "";
-                  const placeholder = el.getAttribute("placeholder") || "";
-                  const text = (el.innerText || "").trim();
-                  const name = el.getAttribute("name") || "";
-                  const type = el.getAttribute("type") || "";
-                  const tag = (el.tagName || "").toLowerCase();
-                  const required = !!(el.required || el.getAttribute("aria-required") === "true");
-                  const inForm = !!el.closest("form");
-                  const hasAssistKeyword = (v) => {
-                    const t = String(v || "").toLowerCase();
-                    return t.includes("simplify") || t.includes("autofill") || t.includes("copilot");
-                  };
-                  const inAssistPanel = (() => {
-                    let cur = el;
-                    for (let i = 0; i < 8 && cur; i++) {
-                      const attrs = [
-                        cur.id || "",
-                        cur.className || "",
-                        cur.getAttribute("data-testid") || "",
-                        cur.getAttribute("aria-label") || "",
-                        cur.getAttribute("title") || "",
-                        cur.getAttribute("name") || ""
-                      ].join(" ");
-                      const text = String(cur.innerText || "").slice(0, 180);
-                      const st = window.getComputedStyle(cur);
-                      const rect = cur.getBoundingClientRect();
-                      const fixedRightPanel =
-                        (st.position === "fixed" || st.position === "sticky") &&
-                        rect.width > 120 &&
-                        rect.width <= 460 &&
-                        rect.left > window.innerWidth * 0.45;
-                      if (hasAssistKeyword(attrs)) return true;
-                      if (fixedRightPanel && hasAssistKeyword(text)) return true;
-                      cur = cur.parentElement;
-                    }
-                    return false;
-                  })();
-                  // Toggle / value state for fingerprinting
-                  let checked = null;
-                  if (type === "checkbox" || type === "radio") {
-                    checked = !!el.checked;
-                  } else if (el.getAttribute("aria-pressed") !== null) {
-                    checked = el.getAttribute("aria-pressed") === "true";
-                  } else if (el.getAttribute("aria-selected") !== null) {
-                    checked = el.getAttribute("aria-selected") === "true";
-                  } else if (el.getAttribute("aria-checked") !== null) {
-                    checked = el.getAttribute("aria-checked") === "true";
-                  }
-                  const rawVal = el.value || "";
-                  const valueHint = rawVal.length > 20 ? rawVal.substring(0, 20) : rawVal;
-                  return { label, aria, placeholder, text, name, type, tag, required, inForm, inAssistPanel, checked, valueHint };
-                }
-                """
-            )
-        except Exception:
-            return {
-                "label": "",
-                "aria": "",
-                "placeholder": "",
-                "text": "",
-                "name": "",
-                "type": "",
-                "tag": "",
-                "required": False,
-                "inForm": False,
-                "inAssistPanel": False,
-                "checked": None,
-                "valueHint": "",
-            }
+    # 不过滤插件面板时，页面脚本也无需判定元素是否位于面板内
+    assist_filter_mode = os.getenv("SNAPSHOT_ASSIST_FILTER_MODE", "exclude").lower()
+    assist_filter_on = assist_filter_mode in {"exclude", "on", "1", "true"}
+    # 一次 evaluate 同时取回快照元素与问题块，问题块暂存给 build_question_blocks
+    payload = extract_page_dom(
+        page, ROLE_ORDER, max_per_role, max_total, detect_assist=assist_filter_on
+    )
+    role_metas = payload.get("roles") or {}
 
     for role in ROLE_ORDER:
-        locator = page.get_by_role(role)
-        try:
-            count = locator.count()
-        except Exception:
-            continue
-        if count <= 0:
-            continue
-
-        for i in range(min(count, max_per_role)):
+        if len(items) >= max_total:
+            break
+        for meta in role_metas.get(role) or []:
             if len(items) >= max_total:
                 break
-            try:
-                el = locator.nth(i)
-                if not el.is_visible(timeout=100):
-                    continue
-                meta = _describe(el)
-                name = (
-                    meta.get("label")
-                    or meta.get("aria")
-                    or meta.get("text")
-                    or meta.get("placeholder")
-                    or meta.get("name")
-                )
-                name = (name or "").strip()
-                if not name:
-                    continue
-                key = (role, name)
-                nth = name_counters.get(key, 0)
-                name_counters[key] = nth + 1
-                raw_checked = meta.get("checked")
-                item = SnapshotItem(
-                    ref="",
-                    role=role,
-                    name=name,
-                    nth=nth,
-                    input_type=meta.get("type") or None,
-                    tag=meta.get("tag") or None,
-                    required=bool(meta.get("required")),
-                    in_form=bool(meta.get("inForm")),
-                    in_assist_panel=bool(meta.get("inAssistPanel")),
-                    checked=bool(raw_checked) if raw_checked is not None else None,
-                    value_hint=str(meta.get("valueHint") or ""),
-                )
-                items.append(item)
-            except Exception:
+            # 显示名已在页面脚本中按 label > aria > text > placeholder > name 选出
+            name = (meta.get("name") or "").strip()
+            if not name:
                 continue
-
-    # 补充 file input（很多上传控件是隐藏 input[type=file]，不能仅依赖可见 role）
-    try:
-        file_locator = page.locator("input[type='file']")
-        file_count = file_locator.count()
-    except Exception:
-        file_count = 0
-
-    for i in range(min(file_count, max_per_role)):
-        if len(items) >= max_total:
-            break
-        try:
-            el = file_locator.nth(i)
-            meta = _describe(el)
-            name = (
-                meta.get("label")
-                or meta.get("aria")
-                or meta.get("name")
-                or meta.get("placeholder")
-                or f"file upload input {i + 1}"
-            )
-            name = (name or "").strip()
-            key = ("file_input", name)
+            key = (role, name)
             nth = name_counters.get(key, 0)
             name_counters[key] = nth + 1
+            raw_checked = meta.get("checked")
             item = SnapshotItem(
                 ref="",
-                role="file_input",
+                role=role,
                 name=name,
                 nth=nth,
-                input_type="file",
-                tag=meta.get("tag") or "input",
+                input_type=meta.get("type") or None,
+                tag=meta.get("tag") or None,
                 required=bool(meta.get("required")),
                 in_form=bool(meta.get("inForm")),
                 in_assist_panel=bool(meta.get("inAssistPanel")),
-                checked=None,
+                checked=bool(raw_checked) if raw_checked is not None else None,
                 value_hint=str(meta.get("valueHint") or ""),
             )
             items.append(item)
-        except Exception:
-            continue
 
-    assist_filter_mode = os.getenv("SNAPSHOT_ASSIST_FILTER_MODE", "exclude").lower()
+    # 补充 file input（很多上传控件是隐藏 input[type=file]，不能仅依赖可见 role）
+    for i, meta in enumerate(payload.get("files") or []):
+        if len(items) >= max_total:
+            break
+        name = (meta.get("name") or f"file upload input {i + 1}").strip()
+        key = ("file_input", name)
+        nth = name_counters.get(key, 0)
+        name_counters[key] = nth + 1
+        item = SnapshotItem(
+            ref="",
+            role="file_input",
+            name=name,
+            nth=nth,
+            input_type="file",
+            tag=meta.get("tag") or "input",
+            required=bool(meta.get("required")),
+            in_form=bool(meta.get("inForm")),
+            in_assist_panel=bool(meta.get("inAssistPanel")),
+            checked=None,
+            value_hint=str(meta.get("valueHint") or ""),
+        )
+        items.append(item)
+
     # 默认排除插件侧面板（例如 Simplify）元素，避免污染主页面决策
-    if assist_filter_mode in {"exclude", "on", "1", "true"}:
+    if assist_filter_on:
         non_assist_items = [item for item in items if not item.in_assist_panel]
         if non_assist_items:
             items = non_assist_items
@@ -229,21 +143,21 @@ def build_ui_snapshot(
     if in_form_items:
         items = in_form_items
 
-    # 必填优先
-    items = sorted(items, key=lambda x: (not x.required, x.role))
+    # 必填优先（全部元素都会编号输出，没有截断，因此无需 top-K 选择）
+    items.sort(key=_sort_rank)
 
+    # 编号与渲染在同一遍中完成
+    snapshot_lines = []
     for idx, item in enumerate(items):
-        ref = _next_ref(idx)
+        ref = _ref_for(idx)
         item.ref = ref
         ref_map[ref] = item
-
-    snapshot_lines = []
-    for item in items:
         type_hint = f", type={item.input_type}" if item.input_type else ""
         req_hint = ", required" if item.required else ""
         snapshot_lines.append(
-            f"{item.ref} | role={item.role}{type_hint}{req_hint} | name={item.name}"
+            f"{ref} | role={item.role}{type_hint}{req_hint} | name={item.name}"
         )
+    remember_question_blocks(page, ref_map, payload.get("blocks"))
 
     snapshot_text = "\n".join(snapshot_lines) if snapshot_lines else "（无可交互元素）"
     return snapshot_text, ref_map
@@ -12,16 +12,33 @@ from typing import Any, Callable
 
 from .ui_snapshot import SnapshotItem
 
+# 回答型按钮的选中态线索一次读回（aria-pressed / aria-checked / class）
+_SELECTION_STATE_JS = """(el) => ({
+  pressed: el.getAttribute("aria-pressed"),
+  checked: el.getAttribute("aria-checked"),
+  className: el.getAttribute("class")
+})"""
+_SELECTED_CLASS_HINTS = ("selected", "active", "checked")
+# input_value 支持的元素（label 会转发到关联控件）；其余元素直接读 value/textContent
+_INPUT_VALUE_TAGS = frozenset(("input", "textarea", "select", "label"))
+_ELEMENT_VALUE_JS = "(el) => el.value || el.textContent || ''"
 
-def get_input_value(locator) -> str:
-    """尽力获取输入框当前值。"""
-    try:
-        return locator.input_value(timeout=500)
-    except Exception:
+
+def get_input_value(locator, tag: str | None = None) -> str:
+    """
+    尽力获取输入框当前值。
+    已知标签不是表单控件（如 contenteditable div）时直接读 value/textContent，
+    跳过必然失败的 input_value 往返；标签未知时保持先 input_value 后兜底。
+    """
+    if tag is None or tag.lower() in _INPUT_VALUE_TAGS:
         try:
-            return locator.evaluate("(el) => el.value || el.textContent || ''")
+            return locator.input_value(timeout=500)
         except Exception:
-            return ""
+            pass
+    try:
+        return locator.evaluate(_ELEMENT_VALUE_JS)
+    except Exception:
+        return ""
 
 
 def is_dropdown_open(locator) -> bool:
@@ -42,6 +59,21 @@ def normalize_answer_label(text: str | None) -> str:
     return ""
 
 
+def _has_selected_state(locator) -> bool:
+    try:
+        state = locator.evaluate(_SELECTION_STATE_JS)
+    except Exception:
+        return False
+    if not isinstance(state, dict):
+        return False
+    if str(state.get("pressed") or "").lower() in ("true", "1"):
+        return True
+    if str(state.get("checked") or "").lower() in ("true", "1"):
+        return True
+    class_name = str(state.get("className") or "").lower()
+    return any(k in class_name for k in _SELECTED_CLASS_HINTS)
+
+
 def verify_ref_action_effect(
     action: Any,
     locator,
@@ -61,36 +93,14 @@ def verify_ref_action_effect(
                     return verify_question_answer_state(
                         action.target_question, expected
                     )
-                # 对未绑定问题文本的回答型按钮，至少确认该按钮出现可见选中态
-                try:
-                    if item.role in ("checkbox", "radio"):
-                        return locator.is_checked()
-                except Exception:
-                    pass
-                try:
-                    pressed = str(locator.get_attribute("aria-pressed") or "").lower()
-                    if pressed in ("true", "1"):
-                        return True
-                except Exception:
-                    pass
-                try:
-                    checked = str(locator.get_attribute("aria-checked") or "").lower()
-                    if checked in ("true", "1"):
-                        return True
-                except Exception:
-                    pass
-                try:
-                    class_name = str(locator.get_attribute("class") or "").lower()
-                    if any(k in class_name for k in ("selected", "active", "checked")):
-                        return True
-                except Exception:
-                    pass
-                return False
+                # 对未绑定问题文本的回答型按钮，至少确认该按钮出现可见选中态；
+                # checkbox/radio 已在上方用 is_checked 判定，这里一次读回其余线索
+                return _has_selected_state(locator)
             return True
         if action.action in ("fill", "type", "select"):
             if action.value is None:
                 return True
-            current = get_input_value(locator)
+            current = get_input_value(locator, item.tag)
             target = str(action.value).strip()
             if target and target in (current or ""):
                 return True
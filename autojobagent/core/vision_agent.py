@@ -42,6 +42,7 @@ from .browser_manager import BrowserManager
 from .debug_probe import append_debug_log
 from .ui_snapshot import build_ui_snapshot, SnapshotItem
 from .heuristics import assess_manual_required
+from .page_text import PageTextView
 from .semantic_perception import (
     SemanticSnapshot,
     build_semantic_snapshot,
@@ -52,6 +53,7 @@ from .outcome_classifier import (
     SubmissionOutcome,
     build_submission_manual_reason as oc_build_submission_manual_reason,
     classify_submission_outcome as oc_classify_submission_outcome,
+    has_completion_form_error as oc_has_completion_form_error,
     looks_like_completion_text as oc_looks_like_completion_text,
 )
 from .loop_guard import (
@@ -283,6 +285,14 @@ def evaluate_progression_block_reason(
     return None
 
 
+def _public_attr_names(obj) -> list[str]:
+    """调试日志用：列出对象的公开属性名（兼容 slots 数据类，无 __dict__）。"""
+    names = getattr(obj, "__dict__", None)
+    if names is None:
+        names = getattr(type(obj), "__slots__", ())
+    return sorted(k for k in names if not k.startswith("_"))[:20]
+
+
 class BrowserAgent:
     """
     像人类一样操作浏览器的 AI Agent。
@@ -335,6 +345,7 @@ class BrowserAgent:
         self.screenshot_dir = STORAGE_DIR / f"job_{self.job_id}_{timestamp}"
         self.screenshot_dir.mkdir(parents=True, exist_ok=True)
         self._last_screenshot_bytes: bytes = b""  # 缓存最近一次截图用于保存
+        self._last_screenshot_b64: str = ""  # 与上面字节对应的 base64，画面未变时复用
         TRACE_DIR.mkdir(parents=True, exist_ok=True)
         self.trace_path = (
             TRACE_DIR / f"agent_trace_job_{self.job_id}_{timestamp}.ndjson"
@@ -717,7 +728,7 @@ class BrowserAgent:
                     )
                     # 保存失败截图（带 _failed 后缀）
                     try:
-                        failed_screenshot = self.page.screenshot(full_page=True)
+                        failed_screenshot = self._grab_screenshot()
                         failed_compressed = self._compress_screenshot(failed_screenshot)
                         failed_path = (
                             self.screenshot_dir
@@ -797,6 +808,8 @@ class BrowserAgent:
             visible_text = self.page.inner_text("body")[:5000]
         except Exception:
             visible_text = ""
+        # 同一轮观察内共享文本视图，各检测器复用前缀与摘要缓存
+        page_text = PageTextView(visible_text)
 
         # 2.5 生成可交互元素快照
         snapshot_text, snapshot_map = build_ui_snapshot(self.page)
@@ -810,7 +823,7 @@ class BrowserAgent:
         )
         self._last_observed_fingerprint = page_fingerprint
         self._last_snapshot_intents = self._infer_snapshot_intents(
-            snapshot_map, visible_text
+            snapshot_map, page_text
         )
         semantic_snapshot = self._build_semantic_snapshot(
             current_url_for_fp,
@@ -900,12 +913,12 @@ class BrowserAgent:
 
         # 2.6 证据化检测登录/验证码等需人工介入场景（避免纯关键词误判）
         evidence = self._collect_manual_required_evidence(
-            visible_text,
+            page_text,
             snapshot_map,
             self._last_snapshot_intents,
         )
         manual_assessment = assess_manual_required(
-            visible_text,
+            page_text,
             password_input_count=evidence["password_input_count"],
             captcha_element_count=evidence["captcha_element_count"],
             has_captcha_challenge_text=evidence["has_captcha_challenge_text"],
@@ -1690,7 +1703,7 @@ class BrowserAgent:
 
     def _collect_manual_required_evidence(
         self,
-        visible_text: str,
+        visible_text: str | PageTextView,
         snapshot_map: dict[str, SnapshotItem],
         snapshot_intents: dict[str, set[str]],
     ) -> dict[str, int | bool]:
@@ -1794,7 +1807,7 @@ class BrowserAgent:
     def _infer_snapshot_intents(
         self,
         snapshot_map: dict[str, SnapshotItem],
-        visible_text: str,
+        visible_text: str | PageTextView,
     ) -> dict[str, set[str]]:
         """为当前快照中的按钮/链接推断语义意图。"""
         return ie_infer_snapshot_intents(
@@ -1806,7 +1819,7 @@ class BrowserAgent:
     def _infer_label_intents(
         self,
         labels: list[str],
-        context: str = "",
+        context: str | PageTextView = "",
     ) -> dict[str, set[str]]:
         """
         对一组 UI 文本做语义意图分类。
@@ -1832,7 +1845,9 @@ class BrowserAgent:
             safe_parse_json_fn=self._safe_parse_json,
         )
 
-    def _infer_text_intents(self, text: str, limit: int = 1200) -> set[str]:
+    def _infer_text_intents(
+        self, text: str | PageTextView, limit: int = 1200
+    ) -> set[str]:
         """
         对整页文本做语义意图分类（低频、可缓存）。
         只输出少量全局意图。
@@ -1850,7 +1865,9 @@ class BrowserAgent:
         """当语义模型不可用时，使用极小硬规则集合兜底。"""
         return ie_fallback_label_intents(label)
 
-    def _intent_cache_key(self, labels: list[str], context: str = "") -> str:
+    def _intent_cache_key(
+        self, labels: list[str], context: str | PageTextView = ""
+    ) -> str:
         return ie_intent_cache_key(labels, context)
 
     def _is_progression_action(
@@ -2310,7 +2327,7 @@ class BrowserAgent:
             locator = self._locator_from_snapshot_item(item)
             if locator is None:
                 continue
-            value = self._get_input_value(locator).strip()
+            value = self._get_input_value(locator, item.tag).strip()
             if not value:
                 total += 1
         return total
@@ -2354,9 +2371,9 @@ class BrowserAgent:
             return False
         return False
 
-    def _get_input_value(self, locator) -> str:
+    def _get_input_value(self, locator, tag: str | None = None) -> str:
         """尽力获取输入框当前值。"""
-        return verifier_get_input_value(locator)
+        return verifier_get_input_value(locator, tag)
 
     def _is_dropdown_open(self, locator) -> bool:
         """检测 autocomplete 下拉是否打开（aria-expanded）。"""
@@ -2804,11 +2821,20 @@ class BrowserAgent:
         返回 base64（用于视觉输入）；采集失败时返回 None，但不阻断语义路径。
         """
         try:
-            png_bytes = self.page.screenshot(full_page=True)
-            original_size = len(png_bytes) / 1024
-            compressed_bytes = self._compress_screenshot(png_bytes)
+            raw_bytes = self._grab_screenshot()
+            original_size = len(raw_bytes) / 1024
+            compressed_bytes = self._compress_screenshot(raw_bytes)
             compressed_size = len(compressed_bytes) / 1024
-            screenshot_b64 = base64.b64encode(compressed_bytes).decode("utf-8")
+            # 页面未变化（如等待 XHR）时截图字节完全相同：
+            # 字节比较几乎无开销，直接复用编码结果
+            if (
+                self._last_screenshot_b64
+                and compressed_bytes == self._last_screenshot_bytes
+            ):
+                screenshot_b64 = self._last_screenshot_b64
+            else:
+                screenshot_b64 = base64.b64encode(compressed_bytes).decode("utf-8")
+                self._last_screenshot_b64 = screenshot_b64
 
             self._last_screenshot_bytes = compressed_bytes
             screenshot_path = self.screenshot_dir / f"step_{self.step_count:02d}.jpg"
@@ -2848,15 +2874,7 @@ class BrowserAgent:
                     sorted_items[0].__class__.__name__ if sorted_items else None
                 ),
                 "first_item_attrs": (
-                    sorted(
-                        [
-                            k
-                            for k in vars(sorted_items[0]).keys()
-                            if not k.startswith("_")
-                        ]
-                    )[:20]
-                    if sorted_items
-                    else []
+                    _public_attr_names(sorted_items[0]) if sorted_items else []
                 ),
             },
             run_id="pre-fix-debug",
@@ -2914,11 +2932,7 @@ class BrowserAgent:
                     "error_type": type(e).__name__,
                     "item_repr": repr(item)[:300] if "item" in locals() else None,
                     "item_attrs": (
-                        sorted([k for k in vars(item).keys() if not k.startswith("_")])[
-                            :20
-                        ]
-                        if "item" in locals()
-                        else []
+                        _public_attr_names(item) if "item" in locals() else []
                     ),
                 },
                 run_id="pre-fix-debug",
@@ -3534,23 +3548,14 @@ class BrowserAgent:
                 self.refresh_exhausted = True
             return False
 
-    def _looks_like_completion_text(self, lower_text: str) -> bool:
-        return oc_looks_like_completion_text(lower_text)
+    def _looks_like_completion_text(self, text: str) -> bool:
+        return oc_looks_like_completion_text(text)
 
     def _verify_completion(self) -> tuple[bool, str]:
         """二次验证：多信号终态评分，避免“已提交仍继续操作”。"""
         try:
             body_text = self.page.inner_text("body")
-            lower_text = body_text.lower()
-            error_indicators = [
-                "this field is required",
-                "please fill",
-                "is required",
-                "missing required",
-                "please complete",
-                "invalid",
-            ]
-            has_error = any(indicator in lower_text for indicator in error_indicators)
+            has_error = oc_has_completion_form_error(body_text)
             has_submit_button = False
             try:
                 _snapshot_text, _snapshot_map = build_ui_snapshot(self.page)
@@ -3603,41 +3608,65 @@ class BrowserAgent:
             self._log(f"⚠ 二次验证出错: {e}", "warn")
             return False, f"验证过程出错: {e}"
 
-    def _compress_screenshot(self, png_bytes: bytes) -> bytes:
+    def _grab_screenshot(self) -> bytes:
+        """
+        整页截图。画面不超过 SCREENSHOT_MAX_WIDTH 时直接由浏览器编码为 JPEG；
+        需要缩放时改取 PNG，缩放后只做一次 JPEG 有损编码，避免两次压缩让小字发糊。
+        """
+        viewport = self.page.viewport_size
+        if viewport and viewport["width"] <= SCREENSHOT_MAX_WIDTH:
+            jpeg_bytes = self.page.screenshot(
+                full_page=True, type="jpeg", quality=SCREENSHOT_JPEG_QUALITY
+            )
+            try:
+                # 只读文件头；横向溢出或高 DPR 时实际像素宽度可能超过视口
+                width = Image.open(io.BytesIO(jpeg_bytes)).width
+            except Exception:
+                width = 0
+            if width <= SCREENSHOT_MAX_WIDTH:
+                return jpeg_bytes
+        return self.page.screenshot(full_page=True)
+
+    def _compress_screenshot(self, raw_bytes: bytes) -> bytes:
         """
-        压缩截图：PNG → JPEG，限制宽度，降低体积但保证识别质量。
+        压缩截图：限制宽度，降低体积但保证识别质量。
 
         压缩策略：
-        - 转换为 JPEG 格式（比 PNG 体积小很多）
-        - 限制最大宽度为 1280px（足够 LLM 识别文字和 UI 元素）
-        - JPEG 质量 75（清晰度和体积的良好平衡）
+        - 浏览器已按 JPEG 质量 75 编码且宽度不超过 1280px 时原样返回，不再解码重编码
+        - 超宽截图（_grab_screenshot 取的是 PNG）缩放到 1280px，
+          足够 LLM 识别文字和 UI 元素
+        - 重新编码为渐进式 JPEG（optimize + progressive，同质量下体积更小）
         """
         try:
-            # 打开 PNG 图片
-            img = Image.open(io.BytesIO(png_bytes))
+            img = Image.open(io.BytesIO(raw_bytes))
+            if img.format == "JPEG" and img.width <= SCREENSHOT_MAX_WIDTH:
+                return raw_bytes
 
             # 如果宽度超过限制，等比例缩小
             if img.width > SCREENSHOT_MAX_WIDTH:
                 ratio = SCREENSHOT_MAX_WIDTH / img.width
-                new_height = int(img.height * ratio)
+                new_height = max(1, int(img.height * ratio))
                 img = img.resize(
                     (SCREENSHOT_MAX_WIDTH, new_height), Image.Resampling.LANCZOS
                 )
 
             # 转换为 RGB（JPEG 不支持 RGBA）
-            if img.mode in ("RGBA", "P"):
+            if img.mode != "RGB":
                 img = img.convert("RGB")
 
-            # 保存为 JPEG
             output = io.BytesIO()
             img.save(
-                output, format="JPEG", quality=SCREENSHOT_JPEG_QUALITY, optimize=True
+                output,
+                format="JPEG",
+                quality=SCREENSHOT_JPEG_QUALITY,
+                optimize=True,
+                progressive=True,
             )
             return output.getvalue()
         except Exception as e:
-            # 压缩失败时返回原始 PNG
+            # 压缩失败时返回原图
             self._log(f"⚠️ 截图压缩失败，使用原图: {e}", "warn")
-            return png_bytes
+            return raw_bytes
 
     def _safe_parse_json(self, raw: str) -> dict | None:
         return planner_safe_parse_json(raw)
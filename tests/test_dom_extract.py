@@ -0,0 +1,32 @@
+from autojobagent.core.dom_extract import DOM_EXTRACT_JS, extract_page_dom
+
+
+class _InstallingPage:
+    """首次调用时页面内尚未安装提取函数，安装后短脚本直接命中。"""
+
+    def __init__(self):
+        self.installed = False
+        self.scripts = []
+
+    def evaluate(self, script, arg=None):
+        self.scripts.append(script)
+        if DOM_EXTRACT_JS in script:
+            self.installed = True
+        elif not self.installed:
+            return None
+        return {"roles": {}, "files": [], "blocks": []}
+
+
+def test_extract_page_dom_installs_script_once_per_document():
+    page = _InstallingPage()
+
+    assert extract_page_dom(page, ["button"], 30) == {
+        "roles": {},
+        "files": [],
+        "blocks": [],
+    }
+    assert [DOM_EXTRACT_JS in script for script in page.scripts] == [False, True]
+
+    extract_page_dom(page, ["button"], 30)
+    assert len(page.scripts) == 3
+    assert DOM_EXTRACT_JS not in page.scripts[-1]
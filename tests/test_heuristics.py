@@ -1,4 +1,5 @@
 from autojobagent.core.heuristics import assess_manual_required, detect_manual_required
+from autojobagent.core.page_text import PageTextView
 
 
 def test_detect_manual_required_captcha():
@@ -66,3 +67,10 @@ def test_assess_manual_required_recaptcha_legal_notice_not_blocking():
         has_apply_cta=True,
     )
     assert result.manual_required is False
+
+
+def test_assess_manual_required_accepts_page_text_view():
+    view = PageTextView("Sign in to continue. Enter your password.")
+    result = assess_manual_required(view, password_input_count=1)
+    assert result.manual_required is True
+    assert result.reason == "login_form_detected"
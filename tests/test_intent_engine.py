@@ -1,9 +1,12 @@
 from autojobagent.core.intent_engine import (
     fallback_label_intents,
     infer_label_intents,
+    infer_label_intents_with_llm,
     infer_snapshot_intents,
     infer_text_intents,
+    intent_cache_key,
 )
+from autojobagent.core.page_text import PageTextView
 from autojobagent.core.ui_snapshot import SnapshotItem
 
 
@@ -72,3 +75,76 @@ def test_infer_text_intents_fallback_keywords():
         safe_parse_json_fn=None,
     )
     assert "upload_request" in intents
+
+
+def test_intent_cache_key_order_insensitive_and_context_aware():
+    key = intent_cache_key(["Next", "Apply"], "ctx")
+    assert key.startswith("labels::")
+    assert key == intent_cache_key(["Apply", "Next"], "ctx")
+    assert key != intent_cache_key(["Apply", "Next"], "other")
+    assert key != intent_cache_key(["ApplyNext"], "ctx")
+
+
+def test_page_text_view_reuses_context_digest_for_cache_keys():
+    text = "  Apply for this job. " + "x" * 2000
+    view = PageTextView(text)
+    assert intent_cache_key(["Apply"], view) == intent_cache_key(["Apply"], text)
+
+    cache_from_view: dict[str, dict[str, list[str]]] = {}
+    cache_from_str: dict[str, dict[str, list[str]]] = {}
+    infer_text_intents(view, intent_cache=cache_from_view)
+    infer_text_intents(text, intent_cache=cache_from_str)
+    assert cache_from_view.keys() == cache_from_str.keys()
+
+
+def test_infer_label_intents_with_llm_filters_unknown_intents():
+    class _Completions:
+        def create(self, **_kwargs):
+            message = type("M", (), {"content": "{}"})()
+            choice = type("C", (), {"message": message})()
+            return type("R", (), {"choices": [choice]})()
+
+    client = type("Client", (), {})()
+    client.chat = type("Chat", (), {"completions": _Completions()})()
+    parsed = {
+        "items": [
+            {"id": "l1", "intents": [" apply_entry ", "bogus"]},
+            {"id": "l2", "intents": "login_action"},
+            {"id": "l3", "intents": {"upload_request": True}},
+        ]
+    }
+    out = infer_label_intents_with_llm(
+        client=client,
+        intent_model="m",
+        labels=["Apply", "Sign in", "Upload"],
+        context="",
+        safe_parse_json_fn=lambda _raw: parsed,
+    )
+    assert out == {"Apply": {"apply_entry"}, "Sign in": set(), "Upload": set()}
+
+
+def test_infer_label_intents_only_sends_ambiguous_labels_to_llm():
+    cache: dict[str, dict[str, list[str]]] = {}
+    sent: list[list[str]] = []
+
+    def fake_llm(labels, _context):
+        sent.append(list(labels))
+        return {"Take the next step": {"progression_action"}}
+
+    result = infer_label_intents(
+        ["Apply Now", "Sign in", "Take the next step"],
+        intent_cache=cache,
+        infer_label_intents_with_llm_fn=fake_llm,
+    )
+    assert sent == [["Take the next step"]]
+    assert "apply_entry" in result["Apply Now"]
+    assert result["Sign in"] == {"login_action"}
+    assert result["Take the next step"] == {"progression_action"}
+
+    sent.clear()
+    infer_label_intents(
+        ["Next", "Upload CV"],
+        intent_cache=cache,
+        infer_label_intents_with_llm_fn=fake_llm,
+    )
+    assert sent == []
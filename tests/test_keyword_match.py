@@ -0,0 +1,22 @@
+from autojobagent.core.keyword_match import (
+    compile_keyword_index,
+    matched_groups,
+    phrase_pattern,
+)
+
+
+def test_matched_groups_agree_with_per_keyword_substring_checks():
+    groups = (
+        ("neg", ("no", "not", "do not")),
+        ("pos", ("yes", "will")),
+        ("notice", ("notice",)),
+    )
+    pattern, owners = compile_keyword_index(groups)
+    for text in ("i do not know", "yes, i will", "notice period", "maybe"):
+        expected = {gid for gid, kws in groups if any(k in text for k in kws)}
+        assert matched_groups(pattern, owners, text) == expected
+
+
+def test_phrase_pattern_ignores_case_by_default():
+    assert phrase_pattern(("thank you",)).search("THANK YOU!") is not None
+    assert phrase_pattern(("thank you",), ignore_case=False).search("THANK YOU") is None
@@ -1,3 +1,4 @@
+from autojobagent.core import llm_runtime
 from autojobagent.core.llm_runtime import run_chat_with_fallback
 
 
@@ -101,3 +102,61 @@ def test_run_chat_with_fallback_exhausts_unsupported_models():
     assert result.error_code == "model_unsupported_exhausted"
     assert "不支持当前请求" in (result.error_summary or "")
     assert client.chat.completions.called_models == ["m1", "m2"]
+
+
+def test_run_chat_with_fallback_rate_limit_match_is_case_insensitive():
+    def handler(model: str):
+        if model == "m1":
+            return Exception("Rate limit reached for requests")
+        return "ok"
+
+    client = _FakeClient(handler)
+    result = run_chat_with_fallback(
+        client=client,
+        fallback_models=["m1", "m2"],
+        start_model_index=0,
+        messages=[{"role": "user", "content": "hi"}],
+        temperature=0.1,
+        max_tokens=100,
+        sleep_seconds=0.0,
+    )
+
+    assert result.ok is True
+    assert result.model == "m2"
+
+
+class _FakeResponse:
+    def __init__(self, headers):
+        self.headers = headers
+
+
+class _RateLimitError(Exception):
+    def __init__(self, message, retry_after):
+        super().__init__(message)
+        self.response = _FakeResponse({"retry-after": retry_after})
+
+
+def test_run_chat_with_fallback_uses_fixed_pause_between_models(monkeypatch):
+    slept: list[float] = []
+    monkeypatch.setattr(llm_runtime.time, "sleep", slept.append)
+
+    def handler(model: str):
+        if model in {"m1", "m2"}:
+            return _RateLimitError("429 Too Many Requests", "30")
+        return "ok"
+
+    client = _FakeClient(handler)
+    result = run_chat_with_fallback(
+        client=client,
+        fallback_models=["m1", "m2", "m3"],
+        start_model_index=0,
+        messages=[{"role": "user", "content": "hi"}],
+        temperature=0.1,
+        max_tokens=100,
+        sleep_seconds=0.5,
+    )
+
+    assert result.ok is True
+    assert result.model == "m3"
+    assert slept == [0.5, 0.5]
+    assert client.chat.completions.called_models == ["m1", "m2", "m3"]
@@ -114,3 +114,30 @@ def test_general_mapper_skips_question_when_no_reliable_match():
     qb = _qb("Pick your favorite color", ["Red", "Green", "Blue"])
     tasks = build_macro_tasks(profile=profile, snapshot_map={}, question_blocks=[qb])
     assert tasks == []
+
+
+def test_general_mapper_falls_through_to_next_matching_rule():
+    profile = {"work_authorization": {"require_visa_sponsorship": False}}
+    qb = _qb(
+        "Are you legally authorized to work in the US, or will you need sponsorship"
+        " (visa sponsorship) now or later?",
+        ["Yes", "No"],
+    )
+    tasks = build_macro_tasks(profile=profile, snapshot_map={}, question_blocks=[qb])
+    assert len(tasks) == 1
+    assert tasks[0].expected_options == ["No"]
+    assert tasks[0].mapping_reason == "visa_sponsorship"
+
+
+def test_build_macro_tasks_reuses_plan_but_returns_fresh_tasks():
+    profile = {"work_authorization": {"require_visa_sponsorship": False}}
+    qb = _qb("Will you require visa sponsorship?", ["Yes", "No"])
+    first = build_macro_tasks(profile=profile, snapshot_map={}, question_blocks=[qb])
+    first[0].status = "done"
+    second = build_macro_tasks(profile=profile, snapshot_map={}, question_blocks=[qb])
+    assert second[0].status == "pending"
+    assert second[0].expected_options == ["No"]
+
+    other = {"work_authorization": {"require_visa_sponsorship": True}}
+    third = build_macro_tasks(profile=other, snapshot_map={}, question_blocks=[qb])
+    assert third[0].expected_options == ["Yes"]
@@ -1,5 +1,8 @@
+from autojobagent.core import manual_gate
 from autojobagent.core.manual_gate import (
     classify_page_state,
+    collect_manual_required_evidence,
+    probe_captcha_selectors,
     select_apply_entry_candidate,
 )
 from autojobagent.core.ui_snapshot import SnapshotItem
@@ -48,3 +51,81 @@ def test_select_apply_entry_candidate_filters_noise():
     )
     assert picked is not None
     assert picked.ref == "e2"
+
+
+class _FakeProbePage:
+    def __init__(self, has_helpers=True):
+        self.evaluate_calls = 0
+        self.has_helpers = has_helpers
+
+    def locator(self, selector):
+        class _Locator:
+            def count(self):
+                return 0
+
+        return _Locator()
+
+    def evaluate(self, script, selectors):
+        self.evaluate_calls += 1
+        if script == manual_gate._CAPTCHA_PROBE_INSTALL_JS:
+            self.has_helpers = True
+        elif not self.has_helpers:
+            return None
+        return [
+            {"count": 1 if i == 0 else 0, "total": 1, "visible": 1, "samples": []}
+            for i, _ in enumerate(selectors)
+        ]
+
+
+def test_collect_manual_required_evidence_probes_captcha_in_one_evaluate():
+    page = _FakeProbePage()
+    evidence, details = collect_manual_required_evidence(
+        page=page,
+        visible_text="Apply now",
+        snapshot_map={},
+        snapshot_intents={},
+        page_text_intents=set(),
+    )
+    assert page.evaluate_calls == 1
+    assert evidence["captcha_element_count"] == 1
+    first = details["captcha_selector_details"]["iframe[src*='recaptcha']"]
+    assert "count" not in first and first["total"] == 1
+
+
+def test_probe_captcha_selectors_installs_helpers_once():
+    page = _FakeProbePage(has_helpers=False)
+    count, _ = probe_captcha_selectors(page, ["a", "b"])
+    assert count == 1
+    assert page.evaluate_calls == 2  # miss -> install and run
+    count, _ = probe_captcha_selectors(page, ["a", "b"])
+    assert count == 1
+    assert page.evaluate_calls == 3
+
+
+def test_collect_manual_required_evidence_flags_clickable_intents():
+    snapshot_map = {
+        "e1": SnapshotItem(ref="e1", role="button", name="Sign in", nth=0),
+        "e2": SnapshotItem(ref="e2", role="textbox", name="Apply", nth=0),
+    }
+    evidence, _ = collect_manual_required_evidence(
+        page=_FakeProbePage(),
+        visible_text="",
+        snapshot_map=snapshot_map,
+        snapshot_intents={"e1": {"login_action"}, "e2": {"apply_entry"}},
+        page_text_intents=set(),
+    )
+    assert evidence["has_login_button"] is True
+    assert evidence["has_apply_cta"] is False
+
+
+def test_select_apply_entry_candidate_tolerates_missing_names():
+    snapshot_map = {
+        "e1": SnapshotItem(ref="e1", role="link", name="Apply for this job", nth=0),
+        "e2": SnapshotItem(ref="e2", role="button", name=None, nth=0),
+    }
+    picked = select_apply_entry_candidate(
+        snapshot_map=snapshot_map,
+        snapshot_intents={"e1": {"apply_entry"}, "e2": {"apply_entry"}},
+        current_url="https://jobs.example.com/job/1",
+    )
+    assert picked is snapshot_map["e2"]
@@ -1,6 +1,8 @@
 from autojobagent.core.outcome_classifier import (
     assess_completion_confidence,
     classify_submission_outcome,
+    has_completion_form_error,
+    looks_like_completion_text,
 )
 
 
@@ -34,3 +36,41 @@ def test_classify_submission_outcome_prefers_validation_error_when_blocked_by_fi
         progression_block_snippets=["Location is required"],
     )
     assert outcome.classification == "validation_error"
+
+
+def test_classify_submission_outcome_keeps_spam_before_transient_priority():
+    outcome = classify_submission_outcome(
+        evidence_text="Suspicious activity detected. Network error, TRY AGAIN LATER.",
+        action_success=False,
+        progression_block_reason=None,
+        progression_block_snippets=[],
+    )
+    assert outcome.classification == "external_blocked"
+
+
+def test_assess_completion_confidence_url_hint_is_case_insensitive():
+    assessment = assess_completion_confidence(
+        body_text="",
+        current_url="https://jobs.example.com/Apply/Thank-You?id=1",
+        has_submit_button=False,
+        has_error=False,
+    )
+    assert assessment.signals["url_success_hint"] is True
+
+
+def test_classify_submission_outcome_success_outranks_earlier_transient_text():
+    outcome = classify_submission_outcome(
+        evidence_text="Request timed out, retrying... Application submitted!",
+        action_success=True,
+        progression_block_reason=None,
+        progression_block_snippets=[],
+    )
+    assert outcome.classification == "success_confirmed"
+    assert outcome.reason_code == "completion_detected"
+
+
+def test_completion_text_checks_match_case_insensitively():
+    assert looks_like_completion_text("THANK YOU FOR APPLYING to Acme")
+    assert not looks_like_completion_text("Apply now")
+    assert has_completion_form_error("Email: This field is REQUIRED")
+    assert not has_completion_form_error("Application submitted")
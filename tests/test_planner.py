@@ -0,0 +1,20 @@
+from autojobagent.core.planner import safe_parse_json, sanitize_simplify_claims
+
+
+def test_safe_parse_json_prefers_json_fence():
+    raw = 'Here:\n```text\nnot json\n```\n```json\n{"action": "click"}\n```'
+    assert safe_parse_json(raw) == {"action": "click"}
+
+
+def test_safe_parse_json_falls_back_to_brace_slice():
+    assert safe_parse_json('Result: {"ok": true} done') == {"ok": True}
+    assert safe_parse_json("no json here") is None
+
+
+def test_sanitize_simplify_claims_only_rewrites_claims():
+    assert sanitize_simplify_claims("Fill the email field") == "Fill the email field"
+    assert sanitize_simplify_claims("Simplify is available") == "Simplify is available"
+    assert sanitize_simplify_claims("simplify已完成填写") == "页面已完成填写"
+    assert sanitize_simplify_claims("Simplify AUTOFILLED the form") == (
+        "页面 AUTOFILLED the form"
+    )
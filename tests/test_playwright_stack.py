@@ -0,0 +1,57 @@
+import inspect
+import traceback
+
+from playwright._impl import _sync_base
+
+from autojobagent.core import playwright_stack
+from autojobagent.core.playwright_stack import (
+    _light_extract_stack,
+    _light_stack,
+    install_fast_stack_capture,
+)
+
+
+def _nested(depth, fn):
+    if depth == 0:
+        return fn()
+    return _nested(depth - 1, fn)
+
+
+def test_light_stack_matches_inspect_stack_frames():
+    # 同一行采集，保证测试函数所在帧的行号一致
+    expected, actual = _nested(3, inspect.stack), _nested(3, _light_stack)
+
+    assert [(f.filename, f.lineno, f.function) for f in actual] == [
+        (f.filename, f.lineno, f.function) for f in expected
+    ]
+    assert all(inspect.isframe(f.frame) for f in actual)
+
+
+def test_light_extract_stack_matches_traceback_order():
+    ref, light = traceback.extract_stack, _light_extract_stack
+    expected, actual = _nested(3, ref), _nested(3, light)
+
+    assert [(f.filename, f.lineno, f.name) for f in actual] == [
+        (f.filename, f.lineno, f.name) for f in expected
+    ]
+    assert actual[-1].line == expected[-1].line
+
+
+def test_install_respects_opt_out(monkeypatch):
+    monkeypatch.setattr(playwright_stack, "_INSTALLED", False)
+    monkeypatch.setattr(_sync_base, "inspect", inspect)
+    monkeypatch.setenv("PW_INSPECT_STACK", "1")
+
+    assert install_fast_stack_capture() is False
+    assert _sync_base.inspect is inspect
+
+
+def test_install_patches_sync_base(monkeypatch):
+    monkeypatch.setattr(playwright_stack, "_INSTALLED", False)
+    monkeypatch.setattr(_sync_base, "inspect", inspect)
+    monkeypatch.setattr(_sync_base, "traceback", traceback)
+    monkeypatch.delenv("PW_INSPECT_STACK", raising=False)
+
+    assert install_fast_stack_capture() is True
+    assert _sync_base.inspect.stack is _light_stack
+    assert _sync_base.traceback.extract_stack is _light_extract_stack
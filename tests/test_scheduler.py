@@ -47,3 +47,50 @@ def test_scheduler_fetch_and_process_failed_job(monkeypatch, isolated_db):
         assert db_job.manual_reason is None
         assert db_job.resume_used == "/tmp/alex_backend_resume.pdf"
         assert db_job.apply_time is not None
+
+
+def test_scheduler_claims_each_pending_job_once(isolated_db):
+    with isolated_db() as session:
+        for i in range(2):
+            session.add(
+                JobPost(
+                    company="Acme",
+                    title=f"Engineer {i}",
+                    link=f"https://example.com/job/{i}",
+                    status=JobStatus.PENDING,
+                )
+            )
+        session.commit()
+
+    scheduler = JobScheduler(config=SchedulerConfig(poll_interval_seconds=0.01))
+    first = scheduler._fetch_next_pending_job()
+    second = scheduler._fetch_next_pending_job()
+    assert first is not None and second is not None
+    assert first.id != second.id
+    assert first.status == JobStatus.IN_PROGRESS
+    assert scheduler._fetch_next_pending_job() is None
+
+
+def test_scheduler_notify_wakes_idle_loop(monkeypatch):
+    import threading
+
+    first_fetch = threading.Event()
+    fetched = threading.Event()
+    calls = []
+
+    scheduler = JobScheduler(config=SchedulerConfig(poll_interval_seconds=30))
+
+    def _fake_fetch():
+        calls.append(1)
+        first_fetch.set()
+        if len(calls) >= 2:
+            fetched.set()
+
+    monkeypatch.setattr(scheduler, "_fetch_next_pending_job", _fake_fetch)
+    scheduler.start()
+    try:
+        assert first_fetch.wait(timeout=2.0)
+        scheduler.notify()
+        assert fetched.wait(timeout=2.0)
+    finally:
+        scheduler.stop()
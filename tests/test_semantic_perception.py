@@ -0,0 +1,46 @@
+from autojobagent.core.semantic_perception import build_semantic_snapshot
+from autojobagent.core.ui_snapshot import SnapshotItem
+
+
+def _snapshot(name: str) -> dict[str, SnapshotItem]:
+    return {
+        "e1": SnapshotItem(ref="e1", role="button", name=name, nth=0),
+        "e2": SnapshotItem(ref="e2", role="textbox", name="Email", nth=0),
+    }
+
+
+def test_build_semantic_snapshot_page_id_ignores_fragment():
+    first = build_semantic_snapshot("https://jobs.example.com/a#x", _snapshot("Next"))
+    second = build_semantic_snapshot("https://jobs.example.com/a#y", _snapshot("Next"))
+    assert first.page_id == second.page_id
+    assert second.url == "https://jobs.example.com/a#y"
+    assert second.submit_candidates == ["e1:Next"]
+
+    changed = build_semantic_snapshot(
+        "https://jobs.example.com/a", _snapshot("Submit application")
+    )
+    assert changed.page_id != first.page_id
+    assert changed.submit_candidates == ["e1:Submit application"]
+
+
+def test_build_semantic_snapshot_keeps_ref_order_and_caps_lists():
+    snapshot_map = {}
+    for i in range(20):
+        ref = f"e{i:02d}"
+        if i % 2:
+            snapshot_map[ref] = SnapshotItem(
+                ref=ref, role="button", name=f"Next {i}", nth=0
+            )
+        else:
+            role = "combobox" if i % 4 else "textbox"
+            snapshot_map[ref] = SnapshotItem(
+                ref=ref, role=role, name=f"Field {i}", nth=0, required=True
+            )
+
+    snapshot = build_semantic_snapshot("https://jobs.example.com/caps", snapshot_map)
+
+    assert len(snapshot.elements) == 20
+    assert snapshot.required_unfilled == [
+        f"{'combobox' if i % 4 else 'textbox'}:Field {i}" for i in range(0, 20, 2)
+    ]
+    assert snapshot.submit_candidates == [f"e{i:02d}:Next {i}" for i in range(1, 16, 2)]
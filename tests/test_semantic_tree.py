@@ -3,8 +3,9 @@ from autojobagent.core.semantic_tree import (
     build_question_blocks,
     format_form_graph,
     format_question_blocks,
+    snapshot_ref_lookup,
 )
-from autojobagent.core.ui_snapshot import SnapshotItem
+from autojobagent.core.ui_snapshot import SnapshotItem, build_ui_snapshot
 
 
 class _TreePage:
@@ -106,3 +107,57 @@ def test_build_form_graph_extracts_required_and_submit():
     rendered = format_form_graph(graph)
     assert "required_unfilled=1" in rendered
     assert "submit_candidates=1" in rendered
+
+
+class _FusedPage:
+    def __init__(self):
+        self.evaluate_calls = 0
+
+    def evaluate(self, _script: str, arg=None):
+        self.evaluate_calls += 1
+        if arg is None:
+            return []
+        return {
+            "roles": {
+                "button": [{"name": "Yes"}, {"name": "No"}],
+            },
+            "files": [],
+            "blocks": [
+                {
+                    "question_text": "Are you over 18?",
+                    "control_type": "single_choice",
+                    "options": [
+                        {"text": "Yes", "role": "button", "selected": False},
+                        {"text": "No", "role": "button", "selected": False},
+                    ],
+                }
+            ],
+        }
+
+
+def test_build_question_blocks_reuses_snapshot_extraction():
+    page = _FusedPage()
+    _text, snapshot_map = build_ui_snapshot(page)
+    blocks = build_question_blocks(page, snapshot_map)
+    assert page.evaluate_calls == 1
+    assert [opt.ref_id for opt in blocks[0].options] == ["e1", "e2"]
+
+    # 暂存只对同一快照生效一次，之后回退为单独提取
+    assert build_question_blocks(page, snapshot_map) == []
+    assert page.evaluate_calls == 2
+
+
+def test_build_question_blocks_reuses_ref_index_without_depleting_it():
+    snapshot_map = {
+        "e6": SnapshotItem(ref="e6", role="button", name="Yes", nth=0),
+        "e7": SnapshotItem(ref="e7", role="button", name="No", nth=0),
+        "e8": SnapshotItem(ref="e8", role="button", name="Yes", nth=1),
+        "e9": SnapshotItem(ref="e9", role="button", name="No", nth=1),
+    }
+    ref_lookup = snapshot_ref_lookup(snapshot_map)
+    for _ in range(2):
+        blocks = build_question_blocks(_TreePage(), snapshot_map, ref_lookup=ref_lookup)
+        assert [[opt.ref_id for opt in block.options] for block in blocks] == [
+            ["e6", "e7"],
+            ["e8", "e9"],
+        ]
@@ -1,5 +1,6 @@
 from autojobagent.core import simplify_helper
 from autojobagent.core.simplify_helper import (
+    SimplifyConfig,
     SimplifyResult,
     SimplifyState,
     probe_simplify_state,
@@ -63,3 +64,122 @@ def test_run_simplify_returns_immediately_when_already_completed(monkeypatch):
     assert result.found is True
     assert result.autofilled is True
     assert "already done" in (result.message or "")
+
+
+class _WaitingFrame:
+    def __init__(self, page):
+        self._page = page
+
+    def evaluate(self, _script, _arg=None):
+        self._page.probe_calls += 1
+        return {
+            "buttonText": None,
+            "againVisible": False,
+            "completeVisible": False,
+            "bodyComplete": self._page.done,
+            "bodyAgain": False,
+        }
+
+    def wait_for_function(self, _script, arg=None, polling=None, timeout=None):
+        self._page.wait_calls.append(timeout)
+        self._page.wait_polling.append(polling)
+        self._page.done = True
+
+
+class _WaitingPage:
+    def __init__(self):
+        self.done = False
+        self.probe_calls = 0
+        self.wait_calls = []
+        self.wait_polling = []
+        self.sleeps = []
+        self.main_frame = _WaitingFrame(self)
+        self.frames = [self.main_frame]
+
+    def wait_for_timeout(self, ms):
+        self.sleeps.append(ms)
+
+
+def test_run_simplify_waits_in_browser_while_running(monkeypatch):
+    page = _WaitingPage()
+    monkeypatch.setattr(
+        simplify_helper,
+        "probe_simplify_state",
+        lambda _p: SimplifyState(status="running", observations=[]),
+    )
+
+    result = run_simplify(page)
+
+    assert result.autofilled is True
+    assert result.message == "Autofill complete text fallback"
+    # 主 frame 每轮只探测一次：等待前一次、等待命中后一次
+    assert page.probe_calls == 2
+    assert len(page.wait_calls) == 1
+    assert page.wait_calls[0] > SimplifyConfig().poll_interval_ms
+    # 页面内按固定间隔轮询，而不是每个动画帧
+    assert page.wait_polling == [simplify_helper._COMPLETION_SIGNAL_POLL_MS]
+    assert page.sleeps == []
+
+
+class _ClickLocator:
+    def __init__(self, frame):
+        self._frame = frame
+
+    @property
+    def first(self):
+        return self
+
+    def click(self):
+        self._frame.clicks += 1
+
+
+class _ClickFrame:
+    def __init__(self):
+        self.clicks = 0
+
+    def evaluate(self, _script, _arg=None):
+        return {
+            "buttonText": "Autofill this page again"
+            if self.clicks
+            else "Autofill this page",
+            "againVisible": False,
+            "completeVisible": False,
+            "bodyComplete": False,
+            "bodyAgain": False,
+        }
+
+    def get_by_text(self, _text, exact=False):
+        return _ClickLocator(self)
+
+    def wait_for_function(self, _script, arg=None, polling=None, timeout=None):
+        return True
+
+
+class _ClickPage:
+    def __init__(self):
+        self.main_frame = _ClickFrame()
+        self.frames = [self.main_frame]
+
+    def wait_for_timeout(self, _ms):
+        return None
+
+
+def test_run_simplify_clicks_once_and_detects_again(monkeypatch):
+    page = _ClickPage()
+    monkeypatch.setattr(
+        simplify_helper,
+        "probe_simplify_state",
+        lambda _p: SimplifyState(status="ready", observations=[]),
+    )
+
+    result = run_simplify(page)
+
+    assert page.main_frame.clicks == 1
+    assert result.autofilled is True
+    assert result.message == "Clicked button text became again"
+    assert result.observations == [
+        "see_btn:Autofill this page",
+        "clicked:Autofill this page",
+        "see_btn:Autofill this page again",
+        "clicked_btn_became_again",
+    ]
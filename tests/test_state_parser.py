@@ -0,0 +1,32 @@
+from autojobagent.core.state_parser import parse_agent_response_payload
+
+
+def _parse(data: dict) -> dict:
+    return parse_agent_response_payload(
+        data,
+        simplify_state="ready",
+        assist_prefill_verified=True,
+        assist_prefill_delta=1,
+        sanitize_claims=lambda text: text,
+    )
+
+
+def test_parse_agent_response_payload_coerces_optional_fields():
+    parsed = _parse(
+        {
+            "status": "continue",
+            "summary": "Fill email",
+            "page_overview": 3,
+            "action_plan": ["fill email", 2],
+            "next_action": {"action": "fill", "ref": "e3", "target_question": 7},
+        }
+    )
+    assert parsed["page_overview"] is None
+    assert parsed["action_plan"] == ["fill email", "2"]
+    assert parsed["next_action"]["ref"] == "e3"
+    assert parsed["next_action"]["target_question"] == "7"
+
+
+def test_parse_agent_response_payload_ignores_non_object_next_action():
+    parsed = _parse({"status": "continue", "next_action": "click submit"})
+    assert parsed["next_action"] is None
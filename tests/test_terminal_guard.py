@@ -9,3 +9,8 @@ def test_raw_response_implies_completion_true():
 def test_raw_response_implies_completion_false():
     raw = "I will now fill the location field and continue."
     assert raw_response_implies_completion(raw) is False
+
+
+def test_raw_response_implies_completion_ignores_case():
+    assert raw_response_implies_completion("THANK YOU FOR APPLYING!") is True
+    assert raw_response_implies_completion("   ") is False
@@ -0,0 +1,122 @@
+from autojobagent.core.ui_snapshot import build_ui_snapshot
+
+
+class _FakeSnapshotPage:
+    def __init__(self, payload):
+        self.payload = payload
+        self.evaluate_calls = []
+
+    def evaluate(self, script, arg=None):
+        self.evaluate_calls.append(arg)
+        return self.payload
+
+
+def test_build_ui_snapshot_uses_single_evaluate():
+    page = _FakeSnapshotPage(
+        {
+            "roles": {
+                "button": [
+                    {"name": "Submit", "tag": "button", "inForm": True},
+                    {"name": ""},
+                ],
+                "textbox": [
+                    {
+                        "name": "Email",
+                        "type": "email",
+                        "required": True,
+                        "inForm": True,
+                    },
+                    {"name": "Email", "inForm": True},
+                ],
+            },
+            "files": [{"inForm": True}],
+        }
+    )
+
+    text, ref_map = build_ui_snapshot(page)
+
+    assert len(page.evaluate_calls) == 1
+    assert page.evaluate_calls[0]["maxPerRole"] == 30
+    assert page.evaluate_calls[0]["maxTotal"] == 160
+    assert [(item.role, item.name, item.nth) for item in ref_map.values()] == [
+        ("textbox", "Email", 0),
+        ("button", "Submit", 0),
+        ("file_input", "file upload input 1", 0),
+        ("textbox", "Email", 1),
+    ]
+    assert (
+        text.splitlines()[0] == "e1 | role=textbox, type=email, required | name=Email"
+    )
+
+
+def test_build_ui_snapshot_survives_evaluate_failure():
+    class _BrokenPage:
+        def evaluate(self, script, arg=None):
+            raise RuntimeError("navigating")
+
+    text, ref_map = build_ui_snapshot(_BrokenPage())
+    assert ref_map == {}
+    assert text == "（无可交互元素）"
+
+
+def test_build_ui_snapshot_orders_required_then_role_name():
+    page = _FakeSnapshotPage(
+        {
+            "roles": {
+                "button": [{"name": "Go"}],
+                "link": [{"name": "Help"}],
+                "textbox": [{"name": "Name", "required": True}],
+                "checkbox": [{"name": "Agree", "required": True}],
+            },
+            "files": [],
+        }
+    )
+
+    _, ref_map = build_ui_snapshot(page)
+
+    assert [(item.role, item.required) for item in ref_map.values()] == [
+        ("checkbox", True),
+        ("textbox", True),
+        ("button", False),
+        ("link", False),
+    ]
+
+
+def test_build_ui_snapshot_stops_at_max_total():
+    page = _FakeSnapshotPage(
+        {
+            "roles": {
+                "button": [{"name": "A"}, {"name": "B"}],
+                "link": [{"name": "C"}],
+            },
+            "files": [{}],
+        }
+    )
+
+    _, ref_map = build_ui_snapshot(page, max_total=2)
+
+    assert page.evaluate_calls[0]["maxTotal"] == 2
+    assert [item.name for item in ref_map.values()] == ["A", "B"]
+
+
+def test_build_ui_snapshot_skips_assist_detection_when_filter_off(monkeypatch):
+    page = _FakeSnapshotPage({"roles": {}, "files": []})
+
+    build_ui_snapshot(page)
+    monkeypatch.setenv("SNAPSHOT_ASSIST_FILTER_MODE", "off")
+    build_ui_snapshot(page)
+
+    assert [call["detectAssist"] for call in page.evaluate_calls] == [True, False]
+
+
+def test_build_ui_snapshot_numbers_unnamed_file_inputs():
+    page = _FakeSnapshotPage(
+        {"roles": {}, "files": [{"name": "Resume", "required": True}, {}]}
+    )
+
+    _, ref_map = build_ui_snapshot(page)
+
+    assert [(item.role, item.name) for item in ref_map.values()] == [
+        ("file_input", "Resume"),
+        ("file_input", "file upload input 2"),
+    ]
@@ -0,0 +1,74 @@
+from types import SimpleNamespace
+
+from autojobagent.core.ui_snapshot import SnapshotItem
+from autojobagent.core.verifier import get_input_value, verify_ref_action_effect
+
+
+class _StateLocator:
+    def __init__(self, state):
+        self.state = state
+        self.evaluate_calls = 0
+
+    def evaluate(self, script, arg=None):
+        self.evaluate_calls += 1
+        if isinstance(self.state, Exception):
+            raise self.state
+        return self.state
+
+    def get_attribute(self, name):
+        raise AssertionError("selection state should be read in one evaluate")
+
+
+def _verify_answer_click(locator):
+    action = SimpleNamespace(action="click", target_question="", selector="Yes")
+    item = SnapshotItem(ref="e1", role="button", name="Yes", nth=0)
+    return verify_ref_action_effect(
+        action,
+        locator,
+        item,
+        is_answer_click_action=lambda action, item: True,
+        verify_question_answer_state=lambda question, expected: False,
+    )
+
+
+def test_answer_click_reads_selection_state_once():
+    locator = _StateLocator({"pressed": None, "checked": "true", "className": ""})
+    assert _verify_answer_click(locator) is True
+    assert locator.evaluate_calls == 1
+
+
+def test_answer_click_accepts_selected_class_hint():
+    locator = _StateLocator(
+        {"pressed": "false", "checked": None, "className": "Option is-Active"}
+    )
+    assert _verify_answer_click(locator) is True
+
+
+def test_answer_click_without_selected_state_fails():
+    assert _verify_answer_click(_StateLocator({"className": "option"})) is False
+    assert _verify_answer_click(_StateLocator(RuntimeError("detached"))) is False
+
+
+class _ValueLocator:
+    def __init__(self):
+        self.calls = []
+
+    def input_value(self, timeout=None):
+        self.calls.append("input_value")
+        raise RuntimeError("Node is not an <input>, <textarea> or <select> element")
+
+    def evaluate(self, script, arg=None):
+        self.calls.append("evaluate")
+        return "typed text"
+
+
+def test_get_input_value_skips_input_value_for_non_form_tags():
+    locator = _ValueLocator()
+    assert get_input_value(locator, "div") == "typed text"
+    assert locator.calls == ["evaluate"]
+
+
+def test_get_input_value_keeps_fallback_when_tag_unknown():
+    locator = _ValueLocator()
+    assert get_input_value(locator) == "typed text"
+    assert locator.calls == ["input_value", "evaluate"]
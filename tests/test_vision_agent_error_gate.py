@@ -1,3 +1,7 @@
+import io
+
+from PIL import Image
+
 from autojobagent.core.browser_manager import BrowserManager
 from autojobagent.core.vision_agent import (
     BrowserAgent,
@@ -850,3 +854,88 @@ def test_run_reports_macro_result_when_submission_branch_stops(monkeypatch):
     result = agent.run()
     assert result is False
     assert calls == [("[macro:t9] progression submit", False)]
+
+
+def test_compress_screenshot_keeps_narrow_jpeg_and_shrinks_wide_png(monkeypatch):
+    monkeypatch.setattr(
+        BrowserManager,
+        "_load_settings",
+        lambda _self: {"llm": {"fallback_models": ["gpt-4o"]}},
+    )
+    agent = BrowserAgent(page=object(), job=_DummyJob())
+
+    narrow = io.BytesIO()
+    Image.new("RGB", (800, 600), "white").save(narrow, format="JPEG")
+    assert agent._compress_screenshot(narrow.getvalue()) == narrow.getvalue()
+
+    wide = io.BytesIO()
+    Image.new("RGBA", (2560, 1600), "white").save(wide, format="PNG")
+    shrunk = Image.open(io.BytesIO(agent._compress_screenshot(wide.getvalue())))
+    assert shrunk.format == "JPEG"
+    assert shrunk.size == (1280, 800)
+
+
+def test_grab_screenshot_uses_png_when_a_resize_will_follow(monkeypatch):
+    monkeypatch.setattr(
+        BrowserManager,
+        "_load_settings",
+        lambda _self: {"llm": {"fallback_models": ["gpt-4o"]}},
+    )
+
+    def _jpeg(width):
+        buf = io.BytesIO()
+        Image.new("RGB", (width, 100), "white").save(buf, format="JPEG")
+        return buf.getvalue()
+
+    class _ShotPage:
+        def __init__(self, viewport_width, jpeg_width):
+            self.viewport_size = {"width": viewport_width, "height": 800}
+            self.jpeg_width = jpeg_width
+            self.calls = []
+
+        def screenshot(self, **kwargs):
+            self.calls.append(kwargs.get("type", "png"))
+            return _jpeg(self.jpeg_width) if kwargs.get("type") == "jpeg" else b"png"
+
+    narrow = _ShotPage(1024, 1024)
+    assert BrowserAgent(page=narrow, job=_DummyJob())._grab_screenshot() == _jpeg(1024)
+    assert narrow.calls == ["jpeg"]
+
+    wide = _ShotPage(1920, 1920)
+    assert BrowserAgent(page=wide, job=_DummyJob())._grab_screenshot() == b"png"
+    assert wide.calls == ["png"]
+
+    # 高 DPR：视口不宽但像素宽度超限，改取 PNG 交给 Pillow 缩放
+    hidpi = _ShotPage(1024, 2048)
+    assert BrowserAgent(page=hidpi, job=_DummyJob())._grab_screenshot() == b"png"
+    assert hidpi.calls == ["jpeg", "png"]
+
+
+def test_capture_step_screenshot_reuses_base64_for_identical_frames(
+    monkeypatch, tmp_path
+):
+    monkeypatch.setattr(
+        BrowserManager,
+        "_load_settings",
+        lambda _self: {"llm": {"fallback_models": ["gpt-4o"]}},
+    )
+    frame = io.BytesIO()
+    Image.new("RGB", (640, 480), "white").save(frame, format="JPEG")
+
+    class _ScreenshotPage:
+        viewport_size = {"width": 640, "height": 480}
+
+        def screenshot(self, **_kwargs):
+            return frame.getvalue()
+
+    agent = BrowserAgent(page=_ScreenshotPage(), job=_DummyJob())
+    agent.screenshot_dir = tmp_path
+    monkeypatch.setattr(agent, "_log", lambda *_args, **_kwargs: None)
+
+    first = agent._capture_step_screenshot()
+    agent.step_count += 1
+    second = agent._capture_step_screenshot()
+
+    assert first
+    assert second is first
+    assert (tmp_path / "step_01.jpg").exists()